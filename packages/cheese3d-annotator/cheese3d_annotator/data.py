@@ -6,6 +6,12 @@ import pandas as pd
 from pathlib import Path
 from typing import List
 
+# prefer the libyaml bindings when PyYAML was built with them
+try:
+    from yaml import CSafeLoader as _YamlLoader, CSafeDumper as _YamlDumper
+except ImportError:
+    from yaml import SafeLoader as _YamlLoader, SafeDumper as _YamlDumper
+
 def keypoints_by_group(keypoints):
     kp_by_group = {}
     for kp in keypoints:
@@ -20,7 +26,7 @@ def keypoints_by_group(keypoints):
 def load_keypoints_and_skeleton(config_path):
     """Load bodyparts and skeleton edges from a YAML config."""
     with open(config_path, 'r') as f:
-        config = yaml.safe_load(f)
+        config = yaml.load(f, Loader=_YamlLoader)
     keypoints = config.get("keypoints", [])
     kp_skeletons = keypoints_by_group(keypoints)
     skeleton_edges = []
@@ -49,35 +55,55 @@ def create_empty_annotations(image_paths: List[str | Path],
                         for img in image_paths}
                    for kp in keypoints}
     with open(yaml_path, "w") as f:
-        yaml.safe_dump(annotations, f)
+        yaml.dump(annotations, f, Dumper=_YamlDumper)
 
 def read_annotations(yaml_path: str | Path):
     with open(yaml_path, "r") as f:
-        annotations = yaml.safe_load(f)
-    rows = []
-    for kp, imgs in annotations.items():
-        for img, pt in imgs.items():
-            x, y = (np.nan if p is None else p for p in pt[0])
-            rows.append({"filename": img, "keypoint": kp, "x": x, "y": y})
-    df = pd.DataFrame(rows)
+        annotations = yaml.load(f, Loader=_YamlLoader)
+
+    return _annotations_to_frame(annotations)
+
+def _annotations_to_frame(annotations):
+    # build whole columns at once (None -> NaN is handled by the float cast)
+    keypoints = [kp for kp, imgs in annotations.items() for _ in imgs]
+    filenames = [img for imgs in annotations.values() for img in imgs]
+    pts = np.array([pt[0] for imgs in annotations.values() for pt in imgs.values()],
+                   dtype=float).reshape(-1, 2)
+    df = pd.DataFrame({"filename": filenames,
+                       "keypoint": keypoints,
+                       "x": pts[:, 0],
+                       "y": pts[:, 1]})
 
     return df
 
 def write_annotations(df: pd.DataFrame, yaml_path: str | Path):
+    """Write a tidy annotations DataFrame back to the YAML format.
+
+    Parameters
+    ----------
+    df : pandas.DataFrame
+        Annotations with "filename", "keypoint", "x", and "y" columns
+        (as returned by `read_annotations`). NaN coordinates are written as null.
+    yaml_path : str or Path
+        Path to write the YAML file.
+    """
+    keys = pd.DataFrame({"keypoint": df["keypoint"].astype(str),
+                         "filename": df["filename"].astype(str)})
+    duplicated = keys.duplicated().to_numpy()
+    for kp, filename in keys[duplicated].itertuples(index=False):
+        logging.warning(f"Encountered multiple rows with {kp=} and {filename=}, skipping...")
+    # pull whole columns out once (as python objects, NaN -> None)
+    coords = df[["x", "y"]].to_numpy(dtype=float)
+    coords = np.where(np.isnan(coords), None, coords).tolist()
     annotations = {}
-    for _, row in df.iterrows():
-        kp = str(row["keypoint"])
-        filename = str(row["filename"])
-        x = None if row["x"] is None else row["x"]
-        y = None if row["y"] is None else row["y"]
-        if kp in annotations:
-            if filename in annotations[kp]:
-                logging.warning(f"Encountered multiple rows with {kp=} and {filename=}, skipping...")
-                continue
-            else:
-                annotations[kp][filename] = [[x, y]]
-        else:
-            annotations[kp] = {filename: [[x, y]]}
+    for kp, filename, xy, skip in zip(keys["keypoint"].tolist(),
+                                      keys["filename"].tolist(),
+                                      coords,
+                                      duplicated.tolist()):
+        if not skip:
+            annotations.setdefault(kp, {})[filename] = [xy]
+    with open(yaml_path, "w") as f:
+        yaml.dump(annotations, f, Dumper=_YamlDumper)
 
 def find_keypoint_conflicts(df: pd.DataFrame, config_keypoints: List[str]) -> List[str]:
     """Find body parts that exist in df but not in config."""
@@ -96,16 +122,22 @@ def ensure_images_in_yaml(image_files: List[str],
     """
     # load existing annotations
     with open(yaml_path, "r") as f:
-        annotations = yaml.safe_load(f)
-    # build in new entries as needed
-    n_files_added = 0
-    for kp in keypoints:
-        if kp in annotations:
-            for img in image_files:
-                if img not in annotations[kp]:
-                    annotations[kp][img] = [[None, None]]
-                    n_files_added += 1
-    # overwrite existing file
-    with open(yaml_path, "w") as f:
-        yaml.safe_dump(annotations, f)
+        annotations = yaml.load(f, Loader=_YamlLoader)
+    df = _annotations_to_frame(annotations)
+    # find the missing (keypoint, filename) pairs in one set operation
+    # (only for keypoints already present in the file)
+    expected = pd.MultiIndex.from_product(
+        [[kp for kp in keypoints if kp in annotations], list(image_files)],
+        names=["keypoint", "filename"]
+    )
+    existing = pd.MultiIndex.from_frame(df[["keypoint", "filename"]])
+    missing = expected.difference(existing, sort=False)
+    n_files_added = len(missing)
+    # only rewrite the file when something changed
+    if n_files_added == 0:
+        print(f"▶︎ No new images to add to {os.path.basename(yaml_path)}")
+        return
+    missing_df = missing.to_frame(index=False).assign(x=np.nan, y=np.nan)
+    df = pd.concat([df, missing_df[df.columns]], ignore_index=True)
+    write_annotations(df, yaml_path)
     print(f"▶︎ Added {n_files_added} new image(s) to {os.path.basename(yaml_path)}")
@@ -10,6 +10,7 @@ Usage (standalone):
 from __future__ import annotations
 
 import argparse
+from bisect import bisect_left
 from pathlib import Path
 from typing import Iterable, Optional, Sequence, Tuple
 
@@ -53,20 +54,9 @@ try:
 except Exception:
     pass
 
-_NUMERIC_DTYPE_KINDS = set("fc")
 _EXCLUDE_COLS = {"Unnamed: 0", "index", "Index"}
 
 
-def _is_numeric_series(s: pd.Series) -> bool:
-    if s.dtype.kind in _NUMERIC_DTYPE_KINDS or np.issubdtype(s.dtype, np.integer):
-        return True
-    try:
-        pd.to_numeric(s, errors="raise")
-        return True
-    except Exception:
-        return False
-
-
 class FeaturesPlotWidget(QtWidgets.QWidget):
     currentFrameChanged = QtCore.Signal(int)
 
@@ -79,13 +69,28 @@ class FeaturesPlotWidget(QtWidgets.QWidget):
         if not self._csv_path.exists():
             raise FileNotFoundError(self._csv_path)
 
-        self.df = pd.read_csv(self._csv_path)
+        self.df = pd.read_csv(self._csv_path, engine="c")
+        # the frame is fixed for the widget's lifetime, so convert plotted columns once
+        self._y_cache: dict[str, np.ndarray] = {}
         self._x_name, self.x = self._choose_x(self.df)
         self.numeric_cols = self._list_numeric_columns(self.df, exclude=self._x_name)
         if len(self.x) != len(self.df):
             self._x_name, self.x = "index", np.arange(len(self.df), dtype=float)
+        self._x_float = self.x.astype(float)
+        # plotted curves only need float32 (half the bytes through pyqtgraph)
+        self._x_plot = np.ascontiguousarray(self._x_float, dtype=np.float32)
+        # finite x positions (and their frame indices) for cursor lookups
+        self._finite_idx = np.flatnonzero(np.isfinite(self._x_float))
+        self._finite_x = self._x_float[self._finite_idx]
+        # plain python copies for the per-mouse-event lookup in _x_to_index
+        # (bisect on a list avoids numpy's per-call dispatch overhead)
+        self._finite_x_list = self._finite_x.tolist()
+        self._finite_idx_list = self._finite_idx.tolist()
 
         self._initial_cols = set(map(str, cols)) if cols else None
+        self._items: dict[str, pg.PlotDataItem] = {}
+        self._shown_cols: list[str] = []
+        self._palette_idx: dict[str, int] = {}
 
         self._build_ui()
         self._populate_columns()
@@ -102,10 +107,21 @@ class FeaturesPlotWidget(QtWidgets.QWidget):
         return "index", np.arange(len(df), dtype=float)
 
     def _list_numeric_columns(self, df: pd.DataFrame, exclude: Optional[str]) -> list[str]:
-        return [
-            str(c) for c in df.columns
-            if c != exclude and c not in _EXCLUDE_COLS and _is_numeric_series(df[c])
-        ]
+        # numeric dtypes need no probing; only the remaining columns are
+        # test-converted (and the successful conversions are kept for plotting)
+        numeric = set(df.select_dtypes(include="number").columns)
+        cols = []
+        for c in df.columns:
+            if c == exclude or c in _EXCLUDE_COLS:
+                continue
+            if c not in numeric:
+                try:
+                    y = pd.to_numeric(df[c], errors="raise")
+                except Exception:
+                    continue
+                self._y_cache[str(c)] = np.ascontiguousarray(y, dtype=np.float32)
+            cols.append(str(c))
+        return cols
 
     def _build_ui(self):
         root = QtWidgets.QVBoxLayout(self)
@@ -177,10 +193,20 @@ class FeaturesPlotWidget(QtWidgets.QWidget):
                                      pen=pg.mkPen((200, 200, 255), width=1))
         self._pi.addItem(self.vline, ignoreBounds=True)
 
-        self.filter_edit.textChanged.connect(self._apply_filter)
+        # coalesce bursts of checkbox/filter edits into a single update
+        self._replot_timer = QtCore.QTimer(self)
+        self._replot_timer.setSingleShot(True)
+        self._replot_timer.setInterval(30)
+        self._replot_timer.timeout.connect(self._replot)
+        self._filter_timer = QtCore.QTimer(self)
+        self._filter_timer.setSingleShot(True)
+        self._filter_timer.setInterval(30)
+        self._filter_timer.timeout.connect(self._apply_filter)
+
+        self.filter_edit.textChanged.connect(lambda _text: self._filter_timer.start())
         self.btn_all.clicked.connect(lambda: self._set_all_checked(True))
         self.btn_none.clicked.connect(lambda: self._set_all_checked(False))
-        self.col_list.itemChanged.connect(self._replot)
+        self.col_list.itemChanged.connect(self._schedule_replot)
 
         self.spn_frame.valueChanged.connect(self._on_frame_spin)
         self.sld_frame.valueChanged.connect(self._on_frame_slider)
@@ -190,6 +216,13 @@ class FeaturesPlotWidget(QtWidgets.QWidget):
     def _populate_columns(self):
         self.col_list.blockSignals(True)
         self.col_list.clear()
+        # resolve feature pens once (columns without a feature color
+        # use a palette color by plot position, chosen at replot time)
+        self._col_pen = {}
+        for name in self.numeric_cols:
+            color = _FEATURE_COLORS.get("-".join(name.split("-")[:-1]))
+            if color is not None:
+                self._col_pen[name] = pg.mkPen(color, width=2)
         for name in self.numeric_cols:
             it = QtWidgets.QListWidgetItem(name)
             it.setFlags(it.flags() | QtCore.Qt.ItemIsUserCheckable)
@@ -208,54 +241,70 @@ class FeaturesPlotWidget(QtWidgets.QWidget):
 
     def _apply_filter(self):
         pattern = self.filter_edit.text().strip()
+        # compile the pattern once per edit (substring match if it is not a valid regex)
+        regex = None
+        if pattern:
+            try:
+                regex = QtCore.QRegularExpression(pattern)
+                if not regex.isValid():
+                    regex = None
+            except Exception:
+                regex = None
+        lower_pattern = pattern.lower()
         for i in range(self.col_list.count()):
             it = self.col_list.item(i)
             name = it.text()
-            show = True
-            if pattern:
-                try:
-                    show = QtCore.QRegularExpression(pattern).match(name).hasMatch()
-                except Exception:
-                    show = pattern.lower() in name.lower()
+            if not pattern:
+                show = True
+            elif regex is not None:
+                show = regex.match(name).hasMatch()
+            else:
+                show = lower_pattern in name.lower()
             it.setHidden(not show)
 
     def _attach_plot(self):
         pg.setConfigOptions(antialias=False)
 
-    def _replot(self):
-        self._pi.clear()
-        self._pi.addLegend()
-        self._pi.showGrid(x=True, y=True, alpha=0.2)
-        self._pi.addItem(self.vline, ignoreBounds=True)
+    def _schedule_replot(self):
+        self._replot_timer.start()
 
+    def _replot(self):
+        # keep one curve per column and only add/remove the ones whose
+        # checked state changed (instead of clearing and rebuilding the plot)
         cols = list(self._iter_checked_columns())
+        checked, shown = set(cols), set(self._shown_cols)
+        for c in self._shown_cols:
+            if c not in checked:
+                self._pi.removeItem(self._items[c])
+        x = self._x_plot
+        for idx, c in enumerate(cols):
+            item = self._items.get(c)
+            if item is None:
+                # connect="finite" breaks the line at NaN gaps while building the path
+                item = pg.PlotDataItem(x, self._y_for(c), pen=self._col_pen.get(c), name=c,
+                                       connect="finite", clipToView=True,
+                                       autoDownsample=True, downsampleMethod="peak")
+                self._items[c] = item
+            # columns without a feature color follow their position in the plot
+            if (c not in self._col_pen) and (self._palette_idx.get(c) != idx):
+                item.setPen(pg.mkPen(pg.intColor(idx), width=2))
+                self._palette_idx[c] = idx
+            if c not in shown:
+                self._pi.addItem(item)
+        if cols != self._shown_cols:
+            # rebuild the (small) legend so it follows the column order
+            legend = self._pi.legend
+            if legend is not None:
+                legend.clear()
+                for c in cols:
+                    legend.addItem(self._items[c], c)
+        self._shown_cols = cols
+
         if not cols:
             self._pi.setTitle("No columns selected")
             return
 
         self._pi.setTitle(f"X: {self._x_name}   |   {len(cols)} signal(s)")
-        x = self.x.astype(float)
-
-        for idx, c in enumerate(cols):
-            y = pd.to_numeric(self.df[c], errors="coerce").to_numpy(dtype=float)
-            color = _FEATURE_COLORS.get("-".join(c.split("-")[:-1]), pg.intColor(idx))
-            item = pg.PlotDataItem(x, y, pen=pg.mkPen(color, width=2), name=c)
-            if hasattr(item, "setClipToView"):
-                item.setClipToView(True)
-            if hasattr(item, "setDownsampling"):
-                try:
-                    item.setDownsampling(auto=True, method='peak')
-                except TypeError:
-                    try:
-                        item.setDownsampling(auto=True)
-                    except Exception:
-                        pass
-            elif hasattr(item, "setAutoDownsample"):
-                try:
-                    item.setAutoDownsample(True)
-                except Exception:
-                    pass
-            self._pi.addItem(item)
 
         if hasattr(self._pi, "enableAutoRange"):
             try:
@@ -265,25 +314,37 @@ class FeaturesPlotWidget(QtWidgets.QWidget):
         self._vb.setMouseEnabled(x=True, y=False)
         self._set_vline_x_from_index(int(self.spn_frame.value()))
 
+    def _y_for(self, c: str) -> np.ndarray:
+        y = self._y_cache.get(c)
+        if y is None:
+            y = pd.to_numeric(self.df[c], errors="coerce").to_numpy(dtype=np.float32)
+            self._y_cache[c] = y
+        return y
+
     def _index_to_x(self, idx: int) -> float:
         idx = int(np.clip(idx, 0, max(0, len(self.x) - 1)))
-        xv = self.x[idx]
+        xv = self._x_float[idx] if len(self.x) > 0 else np.nan
         if not np.isfinite(xv):
-            finite = np.where(np.isfinite(self.x))[0]
+            finite = self._finite_idx
             if finite.size == 0:
                 return float(idx)
-            near = finite[np.argmin(np.abs(finite - idx))]
-            xv = self.x[near]
+            # nearest finite frame (ties go to the earlier frame)
+            i = int(np.searchsorted(finite, idx))
+            if i >= finite.size or (i > 0 and idx - finite[i - 1] <= finite[i] - idx):
+                i -= 1
+            xv = self._finite_x[i]
         return float(xv)
 
     def _x_to_index(self, xv: float) -> int:
-        x = self.x
-        i = int(np.searchsorted(x, xv))
-        if i <= 0:
+        x = self._finite_x_list
+        if not x:
             return 0
+        i = bisect_left(x, xv)
         if i >= len(x):
-            return len(x) - 1
-        return i if abs(x[i] - xv) < abs(xv - x[i - 1]) else i - 1
+            i = len(x) - 1
+        elif i > 0 and not abs(x[i] - xv) < abs(xv - x[i - 1]):
+            i -= 1
+        return self._finite_idx_list[i]
 
     def _set_vline_x_from_index(self, idx: int):
         xv = self._index_to_x(idx)
@@ -364,7 +425,7 @@ class FeaturesPlotWidget(QtWidgets.QWidget):
             if not it.isHidden():
                 it.setCheckState(QtCore.Qt.Checked if checked else QtCore.Qt.Unchecked)
         self.col_list.blockSignals(False)
-        self._replot()
+        self._schedule_replot()
 
 
 def _main(argv: Optional[Iterable[str]] = None):
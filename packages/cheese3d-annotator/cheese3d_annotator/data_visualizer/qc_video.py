@@ -11,11 +11,12 @@ Focus:
 """
 
 from __future__ import annotations
-import sys, re, math, json, warnings
+import sys, re, math, json, warnings, threading
+from dataclasses import dataclass, field
 from pathlib import Path
-from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, Tuple, List, Optional
-from fnmatch import fnmatch
+from fnmatch import translate as _glob_to_regex
 
 import numpy as np
 import cv2
@@ -29,11 +30,25 @@ warnings.filterwarnings("ignore", message="All-NaN slice encountered")
 
 # Camera parsing / ordering
 _CAM_RE = re.compile(r"_([A-Z]{1,2})(?=_|\.)")
+_CAM_TOKEN_SEP_RE = re.compile(r"[^A-Za-z0-9]+")
 # Stable order for tiling (fallback when config doesn't specify)
 _CAM_ORDER = {"TL": 0, "TC": 1, "TR": 2, "L": 3, "BC": 4, "R": 5}
+_CAM_CODES = frozenset(_CAM_ORDER)
+
+# Frames kept in the (direct-mapped) projection cache
+_PROJ_CACHE_FRAMES = 4096
+# Cached projections are whole pixels in int16; this marks NaN / out-of-range points
+_PROJ_MISSING = np.iinfo(np.int16).min
+# Every frame is projected up-front when the whole cache fits in this many bytes
+_PROJ_PRECOMPUTE_BYTES = 128 * 1024 ** 2
+
+# Frames projected ahead of playback while idle (per timer tick / in total)
+_PREFETCH_BATCH = 8
+_PREFETCH_AHEAD = 32
 
 # Unwanted keypoint name patterns (glob-style). Example: "ref(*)" drops ref(0), ref(anything)...
 _UNWANTED = ["ref(*)"]
+_UNWANTED_RE = re.compile("|".join(_glob_to_regex(pat) for pat in _UNWANTED)) if _UNWANTED else None
 
 _COLORMAP = {
     'nose(bottom)': [0.0039, 0.4510, 0.6980, 1.0],
@@ -67,7 +82,7 @@ _COLORMAP = {
 }
 
 def _is_unwanted(name: str) -> bool:
-    return any(fnmatch(name, pat) for pat in _UNWANTED)
+    return _UNWANTED_RE is not None and _UNWANTED_RE.match(name) is not None
 
 # -------------------- Calibration load & 3D->2D projection --------------------
 
@@ -149,17 +164,33 @@ def _normalize_cam_name(name: str) -> str:
     m = _CAM_RE.search(name)
     if m:
         return m.group(1)
-    tokens = re.split(r"[^A-Za-z0-9]+", name)
+    tokens = _CAM_TOKEN_SEP_RE.split(name)
     for t in reversed(tokens):
-        if t in {"TL", "TC", "TR", "L", "BC", "R"}:
+        if t in _CAM_CODES:
             return t
     return name
 
 
-def _build_calib_map(raw: Dict, video_size: Tuple[int, int]) -> Dict[str, dict]:
+@dataclass
+class _CamParams:
+    """One camera's calibration, normalized to float arrays (K already scaled to the video)."""
+    K: np.ndarray
+    dist: np.ndarray
+    rvec: np.ndarray
+    tvec: np.ndarray
+    raw_name: str
+    R: np.ndarray = field(init=False)
+    extra_dist: bool = field(init=False)
+
+    def __post_init__(self):
+        self.R = cv2.Rodrigues(self.rvec)[0]
+        self.extra_dist = _has_extra_dist(self.dist)
+
+
+def _build_calib_map(raw: Dict, video_size: Tuple[int, int]) -> Dict[str, _CamParams]:
     """
     Accept Cheese3D TOML-style or JSON-style structures.
-    Build {cam_code: {'K','dist','rvec','tvec'}}; scale K to video_size.
+    Build {cam_code: _CamParams}; scale K to video_size.
     """
     if any(isinstance(v, dict) and "matrix" in v for v in raw.values()):
         cams = {v.get("name", k): v for k, v in raw.items() if isinstance(v, dict) and "matrix" in v}
@@ -172,7 +203,7 @@ def _build_calib_map(raw: Dict, video_size: Tuple[int, int]) -> Dict[str, dict]:
     else:
         calib_sz = np.array([video_size[0], video_size[1]], float)
 
-    out: Dict[str, dict] = {}
+    out: Dict[str, _CamParams] = {}
     for name, v in cams.items():
         if not isinstance(v, dict):
             continue
@@ -189,54 +220,121 @@ def _build_calib_map(raw: Dict, video_size: Tuple[int, int]) -> Dict[str, dict]:
 
         K = _scale_K_for_video(K, calib_sz, video_size)
         cam_code = _normalize_cam_name(str(name))
-        out[cam_code] = {"K": K, "dist": dist, "rvec": rvec, "tvec": tvec, "raw_name": str(name)}
+        out[cam_code] = _CamParams(K=K, dist=dist, rvec=rvec, tvec=tvec, raw_name=str(name))
     return out
 
 
-def _project_pts(X_world: np.ndarray, prm: dict) -> np.ndarray:
-    """Project 3D -> 2D using cv2.projectPoints."""
+def _quantize_uv(uv: np.ndarray) -> np.ndarray:
+    """Round projections to int16 pixels, marking NaN / out-of-range points as _PROJ_MISSING."""
+    uv = np.rint(uv)
+    bad = ~(np.abs(uv) <= np.iinfo(np.int16).max).all(axis=-1)
+    uv[bad] = 0
+    uv = uv.astype(np.int16)
+    uv[bad] = _PROJ_MISSING
+    return uv
+
+
+def _has_extra_dist(dist: np.ndarray) -> bool:
+    """True if `dist` uses terms beyond (k1, k2, p1, p2, k3)."""
+    return dist.size > 5 and bool(np.any(dist[5:]))
+
+
+def _stack_calib(prms: List[_CamParams]) -> Dict[str, np.ndarray]:
+    """Stack per-camera parameters into (C, ...) arrays for `_project_pts_many`."""
+    return {
+        "R":    np.stack([p.R for p in prms]),
+        "t":    np.stack([p.tvec for p in prms]),
+        "dist": np.stack([np.pad(p.dist[:5], (0, 5 - min(p.dist.size, 5))) for p in prms]),
+        "f":    np.stack([(p.K[0, 0], p.K[1, 1]) for p in prms]),
+        "c":    np.stack([(p.K[0, 2], p.K[1, 2]) for p in prms]),
+    }
+
+
+def _project_pts_many(X_world: np.ndarray, stack: Dict[str, np.ndarray]) -> np.ndarray:
+    """
+    Project 3D -> 2D into every stacked camera at once: (..., 3) -> (C, ..., 2),
+    so several frames (F, N, 3) can be projected in one call as well.
+    Same pinhole + Brown-Conrady (k1,k2,p1,p2,k3) model as cv2.projectPoints,
+    in NumPy (no Jacobian).
+    """
+    X_world = np.asarray(X_world, float)
+    # per-camera parameters broadcast against the point axes
+    bshape = (len(stack["R"]),) + (1,) * (X_world.ndim - 1)
+    Xc = np.einsum("cij,...j->c...i", stack["R"], X_world)
+    Xc += stack["t"].reshape(bshape + (3,))
+    z = Xc[..., 2]
+    # OpenCV maps points on the image plane (z == 0) to z = 1
+    z[z == 0] = 1.0
+    xy = Xc[..., :2]
+    xy /= z[..., None]
+    dist = stack["dist"]
+    if np.any(dist):
+        k1, k2, p1, p2, k3 = (d.reshape(bshape) for d in dist.T)
+        x, y = xy[..., 0], xy[..., 1]
+        r2 = x * x + y * y
+        radial = 1 + r2 * (k1 + r2 * (k2 + r2 * k3))
+        xy = np.stack([x * radial + 2 * p1 * x * y + p2 * (r2 + 2 * x * x),
+                       y * radial + p1 * (r2 + 2 * y * y) + 2 * p2 * x * y], axis=-1)
+    xy *= stack["f"].reshape(bshape + (2,))
+    xy += stack["c"].reshape(bshape + (2,))
+    return xy
+
+
+def _project_pts(X_world: np.ndarray, prm: _CamParams) -> np.ndarray:
+    """Project 3D -> 2D for one camera (OpenCV for distortion models beyond k1..k3)."""
     if X_world.size == 0:
         return np.zeros((0, 2), float)
-    p, _ = cv2.projectPoints(X_world.reshape(-1, 3), prm["rvec"], prm["tvec"], prm["K"], prm["dist"])
-    return p.reshape(-1, 2)
+    if prm.extra_dist:
+        p, _ = cv2.projectPoints(X_world.reshape(-1, 3), prm.rvec, prm.tvec, prm.K, prm.dist)
+        return p.reshape(-1, 2)
+    return _project_pts_many(X_world.reshape(-1, 3), _stack_calib([prm]))[0]
 
 # ----------------------------- Keypoints CSV & colors --------------------------
 
 def _parse_keypoint_bases(columns: List[str]) -> List[str]:
-    cols = set(columns)
-    bases: List[str] = []
-    for c in cols:
-        if c.endswith("_x"):
-            b = c[:-2]
-            if f"{b}_y" in cols and f"{b}_z" in cols:
-                bases.append(b)
-    bases.sort()
-    return bases
-
-
-def _extract_head2world(row) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+    cols = np.asarray(columns, dtype=str)
+    x_cols = cols[np.char.endswith(cols, "_x")]
+    if x_cols.size == 0:
+        return []
+    # candidate bases from "*_x" columns, kept when "*_y" and "*_z" exist too
+    cand = np.char.rpartition(x_cols, "_")[:, 0]
+    ok = np.isin(np.char.add(cand, "_y"), cols) & np.isin(np.char.add(cand, "_z"), cols)
+    return sorted(cand[ok].tolist())
+
+
+def _extract_head2world(df) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+    """Return per-row (R_wh (F,3,3), c_h (F,3)) if all M_ij/center_k columns exist."""
+    M_cols = [f"M_{i}{j}" for i in range(3) for j in range(3)]
+    C_cols = ["center_0", "center_1", "center_2"]
+    if not all(c in df.columns for c in M_cols + C_cols):
+        return None
     try:
-        have_M = all(f"M_{i}{j}" in row for i in range(3) for j in range(3))
-        have_C = all(k in row for k in ("center_0", "center_1", "center_2"))
-        if not (have_M and have_C):
-            return None
-        R_wh = np.array([[row[f"M_{i}{j}"] for j in range(3)] for i in range(3)], float)
-        c_h  = np.array([row["center_0"], row["center_1"], row["center_2"]], float)
+        R_wh = df[M_cols].to_numpy(float).reshape(-1, 3, 3)
+        c_h  = df[C_cols].to_numpy(float)
         return R_wh, c_h
     except Exception:
         return None
 
 
+def _read_pose3d_csv(csv_path: Path):
+    """Read a pose-3d CSV with the coordinate/transform columns fixed to float64."""
+    import pandas as pd
+    cols = pd.read_csv(csv_path, nrows=0).columns.tolist()
+    dtypes = {f"{b}_{a}": np.float64 for b in _parse_keypoint_bases(cols) for a in "xyz"}
+    dtypes.update({c: np.float64 for c in cols if c.startswith(("M_", "center_"))})
+    return pd.read_csv(csv_path, dtype=dtypes, engine="c", memory_map=True)
+
+
 def _load_keypoints_csv_with_xforms(csv_path: Path):
     """
     Returns:
       bases:           ordered list of keypoint base names
-      fr2X_head:       frame -> (N,3) head-space (or world if no xform)
-      fr2names:        frame -> [names for the rows in fr2X_head]
-      fr2xform:        frame -> (R_wh, c_h) if present
+      frames:          (F,) frame number of each row
+      X_head:          (F,N,3) head-space points (or world if no xform), NaN where missing
+      valid:           (F,N) mask of points with all three coordinates
+      xforms:          ((F,3,3) R_wh, (F,3) c_h) if present, else None
     """
-    import pandas as pd
-    df = pd.read_csv(csv_path)
+    df = _read_pose3d_csv(csv_path)
     if "frame" in df.columns:
         df = df.sort_values("frame").reset_index(drop=True)
         frames = df["frame"].astype(int).to_numpy()
@@ -245,57 +343,95 @@ def _load_keypoints_csv_with_xforms(csv_path: Path):
 
     bases = _parse_keypoint_bases(df.columns.tolist())
 
-    fr2X_head: dict[int, np.ndarray] = {}
-    fr2names:  dict[int, List[str]] = {}
-    fr2xform:  dict[int, tuple[np.ndarray, np.ndarray]] = {}
-
-    for i, fr in enumerate(frames):
-        row = df.iloc[i]
-        pts, names = [], []
-        for b in bases:
-            x, y, z = row[f"{b}_x"], row[f"{b}_y"], row[f"{b}_z"]
-            if not (np.isnan(x) or np.isnan(y) or np.isnan(z)):
-                pts.append([float(x), float(y), float(z)])
-                names.append(b)
-        Xh = np.asarray(pts, float) if pts else np.zeros((0, 3), float)
-        fr2X_head[int(fr)] = Xh
-        fr2names[int(fr)]  = names
-        xform = _extract_head2world(row)
-        if xform is not None:
-            fr2xform[int(fr)] = xform
-
-    return bases, fr2X_head, fr2names, fr2xform
-
-
-def _apply_head2world_if_present(Xh: np.ndarray, xform: Optional[tuple[np.ndarray, np.ndarray]]) -> np.ndarray:
+    # pull every coordinate out at once as (F, N, 3) and mask incomplete points
+    X_head = np.stack([df[[f"{b}_{a}" for b in bases]].to_numpy(float) for a in "xyz"], axis=-1)
+    valid = ~np.isnan(X_head).any(axis=-1)
+
+    return bases, frames, X_head, valid, _extract_head2world(df)
+
+
+def _head2world_all(X_head: np.ndarray, xforms: Optional[tuple[np.ndarray, np.ndarray]]) -> np.ndarray:
     """
-    Mirror rig_view: X_world = R_wh.T @ (X_head + c_h)
+    Mirror rig_view for every frame at once: X_world = R_wh.T @ (X_head + c_h)
     """
-    if Xh.size == 0 or xform is None:
-        return Xh
-    R_wh, c_h = xform
-    return (R_wh.T @ (Xh + c_h).T).T
+    if X_head.size == 0 or xforms is None:
+        return X_head
+    R_wh, c_h = xforms
+    return np.einsum("fji,fnj->fni", R_wh, X_head + c_h[:, None, :])
 
 
-def _make_color_map(bases: List[str]) -> Dict[str, np.ndarray]:
+def _make_color_map(bases: List[str]) -> np.ndarray:
     """
     Match rig_view.py behavior: MPL 'turbo' resampled(len(bases)), assign by index.
-    Returns name -> (R,G,B) in 0..1 floats.
+    Returns a (len(bases), 4) RGBA table in 0..1 floats, row i for bases[i].
     """
-    if len(bases) <= 0:
-        return {}
-    colors = np.array([_COLORMAP.get(n, [1.0, 1.0, 1.0, 1.0]) for n in bases], dtype=float)
-    return {name: colors[i] for i, name in enumerate(bases)}
+    return np.array([_COLORMAP.get(n, [1.0, 1.0, 1.0, 1.0]) for n in bases], dtype=np.float32).reshape(-1, 4)
 
 # --------------------------- External frame bus (NEW) --------------------------
 
 class _FrameBus(QtCore.QObject):
     """Signal bus for robust external frame synchronization."""
     frameChanged = QtCore.Signal(int)  # emitted whenever the app changes to a new frame
+    frameRequested = QtCore.Signal(int)       # main thread -> projection worker
+    frameReady = QtCore.Signal(int, object)   # projection worker -> main thread
 
     def __init__(self):
         super().__init__()
 
+
+class _ProjWorker(QtCore.QObject):
+    """
+    Computes frame overlays off the GUI thread (lives in a QThread).
+    Requests arriving within `delay_ms` of each other are coalesced to the latest frame.
+    While idle, `prefetch` is called every `prefetch_ms` until it returns False.
+    """
+    frameReady = QtCore.Signal(int, object)
+
+    def __init__(self, compute, prefetch, delay_ms: int = 10, prefetch_ms: int = 5):
+        super().__init__()
+        self._compute = compute
+        self._prefetch = prefetch
+        self._delay_ms = delay_ms
+        self._prefetch_ms = prefetch_ms
+        self._pending: Optional[int] = None
+        self._timer: Optional[QtCore.QTimer] = None
+        self._prefetch_timer: Optional[QtCore.QTimer] = None
+
+    @QtCore.Slot(int)
+    def requestFrame(self, fr: int):
+        if self._timer is None:
+            # created on first request so the timer lives in the worker thread
+            self._timer = QtCore.QTimer(self)
+            self._timer.setSingleShot(True)
+            self._timer.timeout.connect(self._run)
+            self._prefetch_timer = QtCore.QTimer(self)
+            self._prefetch_timer.setInterval(self._prefetch_ms)
+            self._prefetch_timer.timeout.connect(self._run_prefetch)
+        self._prefetch_timer.stop()
+        self._pending = fr
+        self._timer.start(self._delay_ms)
+
+    def _run(self):
+        fr, self._pending = self._pending, None
+        if fr is None:
+            return
+        try:
+            data = self._compute(fr)
+        except Exception as e:
+            print(f"[warn] Reprojection failed for frame {fr}: {e}")
+            return
+        self.frameReady.emit(fr, data)
+        self._prefetch_timer.start()
+
+    def _run_prefetch(self):
+        try:
+            more = self._prefetch()
+        except Exception as e:
+            print(f"[warn] Reprojection prefetch failed: {e}")
+            more = False
+        if not more:
+            self._prefetch_timer.stop()
+
 # --------------------------------- App (data-only) ----------------------------------------
 
 class QCReprojApp:
@@ -351,8 +487,13 @@ class QCReprojApp:
             sys.exit("❌ Selected group has no videos.")
 
         # Load 3D points (and optional per-frame transforms)
-        self.bases, self.X_head_per_frame, self.names_per_frame, self.xform_per_frame = _load_keypoints_csv_with_xforms(self.pose3d_csv)
-        self.name2color = _make_color_map(self.bases)
+        self.bases, frames, X_head, self.valid_all, xforms = _load_keypoints_csv_with_xforms(self.pose3d_csv)
+        # world-space points for every frame, computed once (rows indexed via _frame_row)
+        # (float32 SoA slab: (F, N, 3) points + (F, N) valid mask)
+        self.X_world_all = np.ascontiguousarray(_head2world_all(X_head, xforms), dtype=np.float32)
+        self._frame_row = {fr: i for i, fr in enumerate(frames.tolist())}
+        self._bases_arr = np.asarray(self.bases, dtype=object)
+        self._color_table = _make_color_map(self.bases)
 
         # Skeleton edges (optional)
         if isinstance(skeleton_config, list):
@@ -360,24 +501,30 @@ class QCReprojApp:
         else:
             self.skeleton_edges = _load_skeleton_edges(skeleton_config)
 
+        # Frame-independent keypoint filter and skeleton edges as indices into self.bases
+        self._keep_base = np.array([not _is_unwanted(b) for b in self.bases], dtype=bool)
+        base_idx = {b: i for i, b in enumerate(self.bases)}
+        self._edges_idx = np.array([(base_idx[a], base_idx[b]) for a, b in self.skeleton_edges
+                                    if a in base_idx and b in base_idx], dtype=int).reshape(-1, 2)
+
         # Open video readers; gather sizes & timeline length
         self.readers: dict[str, VideoReaderNP] = {}
         counts = []
         ref_w = ref_h = None
-        for code, vpath in zip(self.cam_codes, self.vids):
-            rdr = VideoReaderNP(str(vpath))
+        # opening a reader probes the container and decodes a frame (I/O bound, releases the GIL)
+        with ThreadPoolExecutor(max_workers=len(self.vids)) as pool:
+            opened = list(pool.map(lambda vpath: VideoReaderNP(str(vpath)), self.vids))
+        for code, vpath, rdr in zip(self.cam_codes, self.vids, opened):
             self.readers[code] = rdr
-            # try to read frame count from reader; else from cv2 fallback
-            n = getattr(rdr, "n_frames", None) or getattr(getattr(rdr, "_reader", None), "n_frames", None)
-            if n is None:
-                _, _, _, n = self._video_props(vpath)
+            # read frame count & size from the opened reader; reopen with cv2 only if missing
+            n, h, w = self._reader_props(rdr)
+            if n is None or (ref_w is None and (h is None or w is None)):
+                cv_w, cv_h, _, cv_n = self._video_props(vpath)
+                n = cv_n if n is None else n
+                h, w = (cv_h, cv_w) if (h is None or w is None) else (h, w)
             counts.append(int(n))
             if ref_w is None or ref_h is None:
-                shp = getattr(rdr, "shape", None)
-                if shp is not None and len(shp) >= 3:
-                    ref_h, ref_w = int(shp[1]), int(shp[2])
-        if ref_w is None or ref_h is None:
-            ref_w, ref_h, _, _ = self._video_props(self.vids[0])
+                ref_h, ref_w = h, w
         self.video_size = (ref_w, ref_h)
         self.T = int(min(counts)) if counts else 1
 
@@ -391,8 +538,8 @@ class QCReprojApp:
         getattr(qtv, "_dockLayerList", qtv.dockLayerList).setVisible(False)
         getattr(qtv, "_dockLayerControls", qtv.dockLayerControls).setVisible(False)
         rows, cols = self._grid_layout(len(self.cam_codes))
-        self.pt_layers: dict[str, napari.layers.Points] = {}
-        self.sk_layers: dict[str, napari.layers.Shapes] = {}
+        # grid offset (y, x) of each camera tile; overlays bake it into their coordinates
+        self._cam_offsets: dict[str, np.ndarray] = {}
 
         def _add_video_layer(vr, name, trans_xy):
             # Image layer is 3-D (t,y,x) when rgb=True, so translate needs (0, y, x)
@@ -409,23 +556,7 @@ class QCReprojApp:
             label = self.view_code_to_name.get(code, code)
 
             _add_video_layer(vr, label, trans_xy)
-
-            self.pt_layers[code] = self.viewer.add_points(
-                data=np.zeros((0, 2), float),   # (y, x)
-                size=12,
-                name=f"{code}_kpts",
-                face_color="white",             # replaced per-frame
-                translate=trans_xy,             # (y, x)
-            )
-
-            self.sk_layers[code] = self.viewer.add_shapes(
-                data=[],
-                shape_type="path",
-                edge_color="white",
-                edge_width=2.0,
-                name=f"{code}_skel",
-                translate=trans_xy,             # (y, x)
-            )
+            self._cam_offsets[code] = np.asarray(trans_xy, float)
 
             # tolerant camera aliasing
             if code not in self.calib_map:
@@ -439,13 +570,71 @@ class QCReprojApp:
                 elif code not in self.calib_map:
                     print(f"[warn] No calibration for '{code}'. Its overlay will remain empty.")
 
+        # One points layer and one skeleton layer shared by all camera tiles
+        self.pt_layer = self.viewer.add_points(
+            data=np.zeros((0, 2), float),   # (y, x), camera offsets included
+            size=12,
+            name="kpts",
+            face_color="white",             # replaced per-frame
+        )
+        # skeleton as (start, direction) vectors: cheaper to update than Shapes paths
+        sk_kwargs = dict(
+            data=np.zeros((0, 2, 2), float),
+            edge_color="white",
+            edge_width=2.0,
+            name="skel",
+        )
+        try:
+            self.sk_layer = self.viewer.add_vectors(vector_style="line", **sk_kwargs)
+        except TypeError:  # napari without vector styles draws plain lines already
+            self.sk_layer = self.viewer.add_vectors(**sk_kwargs)
+
+        # Cameras projected together in one batch (the rest go through _project_pts)
+        self._batch_cams = [c for c in self.cam_codes
+                            if c in self.calib_map and not self.calib_map[c].extra_dist]
+        self._batch_index = {c: i for i, c in enumerate(self._batch_cams)}
+        self._batch_calib = _stack_calib([self.calib_map[c] for c in self._batch_cams]) if self._batch_cams else None
+
         # Caches & sync
-        self.cam_pts: dict[str, dict[int, np.ndarray]] = defaultdict(dict)
+        # projections live in a bounded (cam, slot, kpt, uv) int16 pixel array;
+        # frame fr maps to slot fr % n_slots and is a hit when the slot's tag == fr
+        n_slots = min(max(self.T, 1), _PROJ_CACHE_FRAMES)
+        # small datasets get one slot per frame and are projected entirely up-front
+        n_all = max(self._frame_row.keys(), default=-1) + 1
+        precompute = (min(self._frame_row.keys(), default=0) >= 0 and
+                      len(self.cam_codes) * n_all * len(self.bases) * 2 * 2 <= _PROJ_PRECOMPUTE_BYTES)
+        if precompute:
+            n_slots = max(n_slots, n_all)
+        self._cam_index = {c: i for i, c in enumerate(self.cam_codes)}
+        self._proj_cache = np.full((len(self._cam_index), n_slots, len(self.bases), 2), _PROJ_MISSING, np.int16)
+        self._proj_len = np.zeros((len(self._cam_index), n_slots), dtype=int)
+        self._proj_tag = np.full((len(self._cam_index), n_slots), -1, dtype=np.int64)
+        if precompute:
+            self._precompute_all()
         self.bus = _FrameBus()
         self.viewer.dims.events.current_step.connect(self._on_napari_step)
 
+        # Projection worker thread (layers are only touched on the GUI thread)
+        self._proj_lock = threading.Lock()
+        self._proj_thread = QtCore.QThread()
+        # slider steps are coalesced on the GUI side (_request_timer), so the worker need not wait
+        self._proj_worker = _ProjWorker(self._compute_frame, self._prefetch, delay_ms=0)
+        self._proj_worker.moveToThread(self._proj_thread)
+        self.bus.frameRequested.connect(self._proj_worker.requestFrame)
+        self._proj_worker.frameReady.connect(self.bus.frameReady)
+        self.bus.frameReady.connect(self._on_frame_ready)
+        self._proj_thread.start()
+        self._pending_frame: Optional[int] = None
+        self._request_timer = QtCore.QTimer()
+        self._request_timer.setSingleShot(True)
+        self._request_timer.timeout.connect(self._flush_frame_request)
+        app = QtWidgets.QApplication.instance()
+        if app is not None:
+            app.aboutToQuit.connect(self._stop_worker)
+
         # First frame + refresh
         self._current_frame = 0
+        self._play_dir = 1
         self._update_reprojections(0)
         try:
             self.viewer.reset_view()
@@ -460,6 +649,14 @@ class QCReprojApp:
     def max_frames(self) -> int:
         return int(self.T)
 
+    def get_Xw(self, fr: int) -> Tuple[np.ndarray, np.ndarray]:
+        """World points (n, 3) of frame `fr` and the (N,) mask of which bases they are."""
+        row = self._frame_row.get(fr)
+        if row is None:
+            return np.zeros((0, 3), np.float32), np.zeros(len(self.bases), dtype=bool)
+        valid = self.valid_all[row]
+        return self.X_world_all[row][valid], valid
+
     def set_frame(self, fr: int) -> None:
         fr = int(np.clip(fr, 0, max(1, self.T) - 1))
         if getattr(self, "_current_frame", None) == fr:
@@ -475,6 +672,17 @@ class QCReprojApp:
 
     # ----------------------------- helpers ------------------------------------
 
+    @staticmethod
+    def _reader_props(rdr) -> Tuple[Optional[int], Optional[int], Optional[int]]:
+        """(n_frames, height, width) from an opened reader; None where unknown."""
+        n = getattr(rdr, "n_frames", None) or getattr(getattr(rdr, "_reader", None), "n_frames", None)
+        h = w = None
+        shp = getattr(rdr, "shape", None)
+        if shp is not None and len(shp) >= 3:
+            n = n or int(shp[0])
+            h, w = int(shp[1]), int(shp[2])
+        return n, h, w
+
     def _video_props(self, p: Path) -> Tuple[int, int, float, int]:
         cap = cv2.VideoCapture(str(p))
         if not cap.isOpened():
@@ -496,70 +704,201 @@ class QCReprojApp:
     def _on_napari_step(self, event=None):
         fr = int(self.viewer.dims.current_step[0] if self.viewer.dims.ndim > 0 else 0)
         if fr != self._current_frame:
+            # remember the scrub/playback direction for prefetching
+            self._play_dir = 1 if fr > self._current_frame else -1
             self._current_frame = fr
-            self._update_reprojections(fr)
             if hasattr(self, "bus"):
+                # coalesce fast scrubbing: only the last step within 8 ms is projected
+                self._pending_frame = fr
+                self._request_timer.start(8)
                 self.bus.frameChanged.emit(fr)
 
+    def _flush_frame_request(self):
+        fr, self._pending_frame = self._pending_frame, None
+        if fr is not None and fr == self._current_frame:
+            self.bus.frameRequested.emit(fr)
+
+    def _on_frame_ready(self, fr: int, data: dict):
+        # drop results for frames the user has already moved past
+        if fr == self._current_frame:
+            self._apply_frame(data)
+
+    def _stop_worker(self):
+        self._proj_thread.quit()
+        self._proj_thread.wait()
+
     # -------------------------- Reprojection & update --------------------------
 
     def _update_reprojections(self, fr: int):
+        """Synchronously compute and show the overlays for `fr`."""
+        self._apply_frame(self._compute_frame(fr))
+
+    def _compute_frame(self, fr: int) -> dict:
+        """Project (with caching) and filter the overlays for `fr`; touches no layers."""
+        with self._proj_lock:
+            return self._compute_frame_locked(fr)
+
+    def _store_proj(self, cam: str, fr: int, uv: np.ndarray):
+        ci, slot = self._cam_index[cam], fr % self._proj_tag.shape[1]
+        uv = _quantize_uv(uv)
+        self._proj_cache[ci, slot, :len(uv)] = uv
+        self._proj_len[ci, slot] = len(uv)
+        self._proj_tag[ci, slot] = fr
+
+    def _precompute_all(self, chunk: int = 1024):
+        """Fill the projection cache for every frame (batched cameras in blocks of `chunk` frames)."""
+        frs  = np.fromiter(self._frame_row.keys(), dtype=np.int64, count=len(self._frame_row))
+        rows = np.fromiter(self._frame_row.values(), dtype=np.int64, count=len(self._frame_row))
+        if self._batch_calib is not None:
+            cis = np.array([self._cam_index[c] for c in self._batch_cams])
+            for start in range(0, len(frs), chunk):
+                fr_blk, row_blk = frs[start:start + chunk], rows[start:start + chunk]
+                try:
+                    uv = _project_pts_many(self.X_world_all[row_blk], self._batch_calib)  # (C, B, N, 2)
+                except Exception:
+                    continue  # left to the per-frame path below
+                # pack each frame's valid points first, as the per-frame cache layout expects
+                valid = self.valid_all[row_blk]
+                order = np.argsort(~valid, axis=1, kind="stable")
+                uv = np.take_along_axis(uv, order[None, :, :, None], axis=2)
+                slots = fr_blk % self._proj_tag.shape[1]
+                self._proj_cache[cis[:, None], slots[None, :]] = _quantize_uv(uv)
+                self._proj_len[cis[:, None], slots[None, :]] = valid.sum(axis=1)[None, :]
+                self._proj_tag[cis[:, None], slots[None, :]] = fr_blk[None, :]
+        # cameras outside the batch (or failed blocks) go through the per-frame path
+        if self._batch_calib is None or len(self._batch_cams) < len(self.cam_codes) or \
+           (self._proj_tag[:, frs % self._proj_tag.shape[1]] != frs).any():
+            for fr, row in zip(frs.tolist(), rows.tolist()):
+                valid = self.valid_all[row]
+                self._project_into_cache(fr, self.X_world_all[row][valid])
+
+    def _project_into_cache(self, fr: int, Xw: np.ndarray, uv_batch: Optional[np.ndarray] = None):
+        """
+        Project the valid world points `Xw` of frame `fr` into every camera not yet cached.
+        `uv_batch` optionally holds the already projected (C_batch, N, 2) result.
+        """
+        slot = fr % self._proj_tag.shape[1]
+        missing = [cam for cam in self.cam_codes if self._proj_tag[self._cam_index[cam], slot] != fr]
+        if not missing:
+            return
+        if Xw.size == 0:
+            for cam in missing:
+                self._store_proj(cam, fr, np.zeros((0, 2), float))
+            return
+        if uv_batch is None and self._batch_calib is not None and any(cam in self._batch_index for cam in missing):
+            try:
+                uv_batch = _project_pts_many(Xw, self._batch_calib)
+            except Exception:
+                uv_batch = None
+        for cam in missing:
+            ci = self._batch_index.get(cam)
+            if uv_batch is not None and ci is not None:
+                self._store_proj(cam, fr, uv_batch[ci])
+                continue
+            prm = self.calib_map.get(cam)
+            if prm is None:
+                self._store_proj(cam, fr, np.zeros((0, 2), float))
+                continue
+            try:
+                self._store_proj(cam, fr, _project_pts(Xw, prm))
+            except Exception:
+                self._store_proj(cam, fr, np.zeros((0, 2), float))
+
+    def _prefetch(self) -> bool:
+        """
+        Project up to _PREFETCH_BATCH uncached frames ahead of the current one
+        (in the recent playback direction) in one batched call.
+        Returns False when everything within _PREFETCH_AHEAD is already cached.
+        """
+        with self._proj_lock:
+            fr0, step = self._current_frame, self._play_dir
+            n_slots = self._proj_tag.shape[1]
+            # never look so far ahead that prefetched frames evict the current one
+            ahead = min(_PREFETCH_AHEAD, n_slots - 1)
+            todo = []
+            for k in range(1, ahead + 1):
+                fr = fr0 + k * step
+                if fr in self._frame_row and (self._proj_tag[:, fr % n_slots] != fr).any():
+                    todo.append(fr)
+                    if len(todo) == _PREFETCH_BATCH:
+                        break
+            if not todo:
+                return False
+            rows = [self._frame_row[fr] for fr in todo]
+            uv_all = None
+            if self._batch_calib is not None:
+                try:
+                    uv_all = _project_pts_many(self.X_world_all[rows], self._batch_calib)  # (C, B, N, 2)
+                except Exception:
+                    uv_all = None
+            for b, (fr, row) in enumerate(zip(todo, rows)):
+                valid = self.valid_all[row]
+                self._project_into_cache(fr, self.X_world_all[row][valid],
+                                         None if uv_all is None else uv_all[:, b][:, valid])
+            return True
+
+    def _compute_frame_locked(self, fr: int) -> dict:
         # Build current world points & label list
-        Xh    = self.X_head_per_frame.get(fr, np.zeros((0, 3), float))
-        names = self.names_per_frame.get(fr, [])
-        xform = self.xform_per_frame.get(fr, None)
-        Xw    = _apply_head2world_if_present(Xh, xform)
+        Xw, valid = self.get_Xw(fr)
 
         # Points per camera (cache projections per frame/cam)
-        if Xw.size:
-            for cam in self.pt_layers.keys():
-                if fr not in self.cam_pts.get(cam, {}):
-                    prm = self.calib_map.get(cam)
-                    if prm is None:
-                        self.cam_pts.setdefault(cam, {})[fr] = np.zeros((0, 2), float)
-                        continue
-                    try:
-                        self.cam_pts.setdefault(cam, {})[fr] = _project_pts(Xw, prm)
-                    except Exception:
-                        self.cam_pts.setdefault(cam, {})[fr] = np.zeros((0, 2), float)
-
-        # Apply unwanted-name filter for this frame
-        def _filter_names_points(curr_names: List[str], uv: np.ndarray) -> tuple[List[str], np.ndarray]:
-            if uv.size == 0 or not curr_names:
-                return [], np.zeros((0, 2), float)
-            keep_mask = np.array([not _is_unwanted(n) for n in curr_names], dtype=bool)
-            return [n for n, k in zip(curr_names, keep_mask) if k], uv[keep_mask]
-
-        # For skeleton segments we’ll need name->idx mapping after filtering
-        for cam in self.pt_layers.keys():
-            uv_full = self.cam_pts.get(cam, {}).get(fr, np.zeros((0, 2), float))
-            names_filt, uv = _filter_names_points(names, uv_full)
-
-            # --- Points layer (y, x) with rig_view-like colors ---
-            if uv.size == 0:
-                self.pt_layers[cam].data = np.zeros((0, 2), float)
-                self.pt_layers[cam].properties = {}
+        slot = fr % self._proj_tag.shape[1]
+        self._project_into_cache(fr, Xw)
+
+        # Camera-independent: unwanted-name filter, labels, colors, skeleton edges
+        # (edges are remapped to indices into the filtered points)
+        keep     = valid & self._keep_base
+        keep_sub = keep[valid]
+        labels   = self._bases_arr[keep]
+        colors   = self._color_table[keep]
+        pos      = np.cumsum(keep) - 1
+        edges    = pos[self._edges_idx[keep[self._edges_idx].all(axis=1)]]
+
+        pts, pt_labels, pt_colors, vecs = [], [], [], []
+        for cam in self.cam_codes:
+            ci = self._cam_index[cam]
+            # uncalibrated / failed cameras are cached with no points
+            if self._proj_tag[ci, slot] == fr and self._proj_len[ci, slot] == len(keep_sub):
+                uv_q = self._proj_cache[ci, slot, :len(keep_sub)][keep_sub]
+                uv = uv_q.astype(float)
+                uv[(uv_q == _PROJ_MISSING).any(axis=-1)] = np.nan
             else:
-                pts_yx = uv[:, [1, 0]]                    # (v,u) -> (y,x)
-                self.pt_layers[cam].data = pts_yx
-                labels = np.asarray(names_filt, dtype=object)
-                self.pt_layers[cam].properties = {"label": labels}
-                colors = np.array([self.name2color.get(n, (1.0, 1.0, 0.0)) for n in names_filt], float)  # default yellow
-                self.pt_layers[cam].face_color = colors
-
-            # --- Skeleton layer (list of 2-point paths in (y,x)) ---
-            segs: List[np.ndarray] = []
-            if uv.size and self.skeleton_edges and names_filt:
-                name2idx = {n: i for i, n in enumerate(names_filt)}
-                for a, b in self.skeleton_edges:
-                    ia = name2idx.get(a); ib = name2idx.get(b)
-                    if ia is None or ib is None:
-                        continue
-                    pa, pb = uv[ia], uv[ib]
-                    if np.any(np.isnan(pa)) or np.isnan(pb).any():
-                        continue
-                    segs.append(np.array([[pa[1], pa[0]], [pb[1], pb[0]]], float))
-            self.sk_layers[cam].data = segs
+                uv = np.zeros((0, 2), float)
+
+            if uv.size == 0:
+                continue
+            off = self._cam_offsets[cam]
+            pts.append(uv[:, ::-1] + off)                                   # (v,u) -> (y,x) in the grid
+            pt_labels.append(labels)
+            pt_colors.append(colors)
+
+            # Skeleton segments as (E, 2, yx) vectors: (start, end - start)
+            if len(edges):
+                segs = uv[edges][:, :, ::-1]                                 # (E, 2, yx) view
+                segs = segs[~np.isnan(segs).any(axis=(1, 2))]
+                vecs.append(np.stack([segs[:, 0] + off, segs[:, 1] - segs[:, 0]], axis=1))
+
+        if not pts:
+            return {"pts": np.zeros((0, 2), float), "labels": None, "colors": None,
+                    "vecs": np.zeros((0, 2, 2), float)}
+        return {"pts": np.concatenate(pts),
+                "labels": np.concatenate(pt_labels),
+                "colors": np.concatenate(pt_colors),
+                "vecs": np.concatenate(vecs) if vecs else np.zeros((0, 2, 2), float)}
+
+    def _apply_frame(self, data: dict):
+        """Push computed overlays into the napari layers (GUI thread only)."""
+        # --- Points layer (y, x) with rig_view-like colors ---
+        if data["pts"].size == 0:
+            self.pt_layer.data = data["pts"]
+            self.pt_layer.properties = {}
+        else:
+            self.pt_layer.data = data["pts"]
+            self.pt_layer.properties = {"label": data["labels"]}
+            self.pt_layer.face_color = data["colors"]
+
+        # --- Skeleton layer ---
+        self.sk_layer.data = data["vecs"]
 
     def run(self):
         napari.run()
@@ -108,15 +108,18 @@ def _rvec_to_R(rvec: np.ndarray) -> np.ndarray:
     Rm, _ = cv2.Rodrigues(np.asarray(rvec, float).reshape(3, 1))
     return Rm
 
-def _imgplane_corners(K: np.ndarray, depth: float, size: Tuple[int, int]):
-    fx, fy, cx, cy = K[0, 0], K[1, 1], K[0, 2], K[1, 2]
-    w, h = size
-    pix = np.array([[0, 0], [w, 0], [w, h], [0, h]], float)
-    X = np.empty((4, 3))
-    X[:, 0] = (pix[:, 0] - cx) * depth / fx
-    X[:, 1] = (pix[:, 1] - cy) * depth / fy
-    X[:, 2] = depth
-    return X
+def _imgplane_corners(K: np.ndarray, depth: float, size) -> np.ndarray:
+    """Image-plane corners at `depth` in camera coordinates: K (...,3,3), size (...,2) -> (...,4,3)."""
+    K = np.asarray(K, float)
+    size = np.asarray(size, float)
+    fx, fy, cx, cy = (K[..., 0, 0, None], K[..., 1, 1, None], K[..., 0, 2, None], K[..., 1, 2, None])
+    w, h = size[..., 0, None], size[..., 1, None]
+    zero = np.zeros_like(w)
+    px = np.concatenate([zero, w, w, zero], axis=-1)   # corners (0,0), (w,0), (w,h), (0,h)
+    py = np.concatenate([zero, zero, h, h], axis=-1)
+    return np.stack([(px - cx) * depth / fx,
+                     (py - cy) * depth / fy,
+                     np.full_like(px, depth)], axis=-1)
 
 def _parse_keypoint_bases(columns: List[str]) -> List[str]:
     cols = set(columns)
@@ -129,18 +132,26 @@ def _parse_keypoint_bases(columns: List[str]) -> List[str]:
     bases.sort()
     return bases
 
-def _extract_head2world(row) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+def _extract_head2world(df: pd.DataFrame) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+    """Return per-row (R_wh (F,3,3), c_h (F,3)) if all M_ij/center_k columns exist."""
+    M_cols = [f"M_{i}{j}" for i in range(3) for j in range(3)]
+    C_cols = ["center_0", "center_1", "center_2"]
+    if not all(c in df.columns for c in M_cols + C_cols):
+        return None
     try:
-        have_M = all(f"M_{i}{j}" in row for i in range(3) for j in range(3))
-        have_C = all(k in row for k in ("center_0", "center_1", "center_2"))
-        if not (have_M and have_C):
-            return None
-        R_wh = np.array([[row[f"M_{i}{j}"] for j in range(3)] for i in range(3)], float)
-        c_h  = np.array([row["center_0"], row["center_1"], row["center_2"]], float)
+        R_wh = df[M_cols].to_numpy(float).reshape(-1, 3, 3)
+        c_h  = df[C_cols].to_numpy(float)
         return R_wh, c_h
     except Exception:
         return None
 
+def _read_pose3d_csv(path: Path) -> pd.DataFrame:
+    """Read a pose-3d CSV with the coordinate/transform columns fixed to float64."""
+    cols = pd.read_csv(path, nrows=0).columns.tolist()
+    dtypes = {f"{b}_{a}": np.float64 for b in _parse_keypoint_bases(cols) for a in "xyz"}
+    dtypes.update({c: np.float64 for c in cols if c.startswith(("M_", "center_"))})
+    return pd.read_csv(path, dtype=dtypes, engine="c", memory_map=True)
+
 def _apply_head2world_if_present(Xh: np.ndarray, xform: Optional[tuple[np.ndarray, np.ndarray]]) -> np.ndarray:
     """
     Mirror qc_video/rig_view: X_world = R_wh.T @ (X_head + c_h)
@@ -148,7 +159,8 @@ def _apply_head2world_if_present(Xh: np.ndarray, xform: Optional[tuple[np.ndarra
     if Xh.size == 0 or xform is None:
         return Xh
     R_wh, c_h = xform
-    return (-R_wh.T @ (Xh + c_h).T).T
+    # row-vector form of (-R_wh.T @ (X_head + c_h).T).T, no transposed copies
+    return -((Xh + c_h) @ R_wh)
 
 
 # ─────────────────────────────────────────────── main viewer (data-only)
@@ -178,18 +190,26 @@ class RigViewer:
         # Optional 3-D annotations dataframe (pose-3d)
         self._anno_df: Optional[pd.DataFrame] = None
         self._anno_bases: List[str] = []
+        # per-row arrays pulled out of the dataframe once: (F,N,3) points, per-row xforms
+        self._anno_xyz: Optional[np.ndarray] = None
+        self._anno_xforms: Optional[Tuple[np.ndarray, np.ndarray]] = None
         if self.annotation_path and self.annotation_path.is_file():
             try:
-                df = pd.read_csv(self.annotation_path)
+                df = _read_pose3d_csv(self.annotation_path)
                 # sort by 'frame' if present
                 if "frame" in df.columns:
                     df = df.sort_values("frame").reset_index(drop=True)
                 self._anno_df = df
                 self._anno_bases = _parse_keypoint_bases(df.columns.tolist())
+                self._anno_xyz = np.stack([df[[f"{b}_{a}" for b in self._anno_bases]].to_numpy(float)
+                                           for a in "xyz"], axis=-1)
+                self._anno_xforms = _extract_head2world(df)
             except Exception as e:
                 print(f"[warn] Could not load annotations: {e}")
                 self._anno_df = None
                 self._anno_bases = []
+                self._anno_xyz = None
+                self._anno_xforms = None
 
         # Skeleton edges (optional)
         if isinstance(skeleton_config, list):
@@ -197,6 +217,23 @@ class RigViewer:
         else:
             self._skeleton_edges = _load_skeleton_edges(skeleton_config)
 
+        # Unwanted-name filter, compiled once and resolved over the bases
+        # (glob-ish: 'ref(*)' -> '^ref\(.*\)$')
+        self._unwanted_re = re.compile("|".join("(?:^" + re.escape(pat).replace("\\*", ".*") + "$)"
+                                                for pat in self._UNWANTED)) if self._UNWANTED else None
+        self._base_keep_mask = np.array([self._unwanted_re is None or self._unwanted_re.fullmatch(b) is None
+                                         for b in self._anno_bases], dtype=bool)
+        # per-base colors / labels, selected with the frame's mask
+        self._base_colors = np.asarray([_COLORMAP.get(b, [1.0, 1.0, 1.0, 1.0]) for b in self._anno_bases],
+                                       dtype=np.float32).reshape(-1, 4)
+        self._base_names_obj = np.asarray(self._anno_bases, dtype=object)
+        # skeleton edges as index pairs into the bases (edges with unknown endpoints dropped)
+        base_idx = {b: i for i, b in enumerate(self._anno_bases)}
+        edges = [(base_idx[a], base_idx[b]) for a, b in self._skeleton_edges
+                 if a in base_idx and b in base_idx]
+        self._edge_ia = np.array([a for a, _ in edges], dtype=np.int64)
+        self._edge_ib = np.array([b for _, b in edges], dtype=np.int64)
+
         # Frame range: prefer annotations, else features, else 0
         self._frame_min = 0
         if self._anno_df is not None and len(self._anno_df) > 0:
@@ -326,28 +363,32 @@ class RigViewer:
             print("[warn] No camera sections found in calibration file.")
             return
 
-        frusta = []
+        Ks, Rs, ts, sizes = [], [], [], []
         for cam in cams.values():
             try:
-                K = np.asarray(cam.get("matrix") or cam.get("K") or cam.get("camera_matrix")).reshape(3, 3)
+                K = np.asarray(cam.get("matrix") or cam.get("K") or cam.get("camera_matrix"), float).reshape(3, 3)
                 rvec = np.asarray(cam.get("rotation") or cam.get("rvec")).reshape(3)
-                tvec = np.asarray(cam.get("translation") or cam.get("tvec")).reshape(3)
+                tvec = np.asarray(cam.get("translation") or cam.get("tvec"), float).reshape(3)
                 Rm = _rvec_to_R(rvec)
-                C = (Rm.T @ tvec)
-                size = tuple(cam.get("size") or (640, 480))
+                size = np.asarray(cam.get("size") or (640, 480), float).reshape(2)
             except Exception as e:
                 print(f"[warn] Bad camera entry skipped: {e}")
                 continue
-
-            imgplane = _imgplane_corners(K, frustum_z, size)
-            imgplane_w = (-Rm.T @ imgplane.T).T + C
-            for i in range(4):
-                frusta.append(np.stack([C, imgplane_w[i]]))
-                frusta.append(np.stack([imgplane_w[i], imgplane_w[(i + 1) % 4]]))
-
-        if frusta:
+            Ks.append(K); Rs.append(Rm); ts.append(tvec); sizes.append(size)
+
+        if Ks:
+            # all cameras at once: centers, image-plane corners in world, 8 segments per camera
+            R = np.stack(Rs)
+            C = np.einsum("nji,nj->ni", R, np.stack(ts))                               # Rm.T @ tvec
+            imgplane = _imgplane_corners(np.stack(Ks), frustum_z, np.stack(sizes))      # (n, 4, 3)
+            imgplane_w = -np.einsum("nji,nkj->nki", R, imgplane) + C[:, None, :]
+            frusta = np.empty((len(Ks), 8, 2, 3))
+            frusta[:, 0::2, 0] = C[:, None, :]                                          # center -> corner i
+            frusta[:, 0::2, 1] = imgplane_w
+            frusta[:, 1::2, 0] = imgplane_w                                             # corner i -> i+1
+            frusta[:, 1::2, 1] = np.roll(imgplane_w, -1, axis=1)
             self.viewer.add_shapes(
-                np.asarray(frusta, float),
+                frusta.reshape(-1, 2, 3),
                 shape_type="path",
                 edge_color="cyan",
                 edge_width=0.2,
@@ -368,43 +409,29 @@ class RigViewer:
         if frame_idx < 0 or frame_idx >= len(self._anno_df):
             return
 
-        row = self._anno_df.iloc[frame_idx]
-
         # gather xyz for every base present in this row
-        names, pts = [], []
-        for b in self._anno_bases:
-            try:
-                x, y, z = row[f"{b}_x"], row[f"{b}_y"], row[f"{b}_z"]
-                if not (np.isnan(x) or np.isnan(y) or np.isnan(z)):
-                    names.append(b)
-                    pts.append([float(x), float(y), float(z)])
-            except Exception:
-                continue
+        Xh_all = self._anno_xyz[frame_idx]
+        valid = ~np.isnan(Xh_all).any(axis=1)
 
-        if not pts:
+        if not valid.any():
             if self._points_layer is not None:
                 self._points_layer.visible = False
             if self._skel_layer is not None:
                 self._skel_layer.visible = False
             return
 
-        # filter unwanted names (glob-ish)
-        def _unwanted(n: str) -> bool:
-            for pat in self._UNWANTED:
-                # convert 'ref(*)' to regex
-                rx = "^" + re.escape(pat).replace("\\*", ".*") + "$"
-                if re.fullmatch(rx, n):
-                    return True
-            return False
-
-        keep = [not _unwanted(n) for n in names]
-        names = [n for n, k in zip(names, keep) if k]
-        Xh = np.asarray([p for p, k in zip(pts, keep) if k], float)
+        # filter unwanted names (precomputed mask over the bases)
+        valid &= self._base_keep_mask
+        names = self._base_names_obj[valid]
+        Xh = Xh_all[valid]
 
         # optional head→world transform per row
-        Xw = _apply_head2world_if_present(Xh, _extract_head2world(row))
+        xform = None
+        if self._anno_xforms is not None:
+            xform = (self._anno_xforms[0][frame_idx], self._anno_xforms[1][frame_idx])
+        Xw = _apply_head2world_if_present(Xh, xform)
 
-        colors = np.array([_COLORMAP.get(n, [1.0, 1.0, 1.0, 1.0]) for n in names], dtype=float)
+        colors = self._base_colors[valid]
 
         # points layer
         if self._points_layer is None:
@@ -413,28 +440,26 @@ class RigViewer:
                 size=1.0,
                 face_color=colors,
                 name="3-D annotations",
-                properties={"label": np.asarray(names, dtype=object)},
+                properties={"label": names},
                 text={"string": "{label}", "visible": False},
             )
         else:
             self._points_layer.data = Xw
             self._points_layer.face_color = colors
-            self._points_layer.properties = {"label": np.asarray(names, dtype=object)}
+            self._points_layer.properties = {"label": names}
             self._points_layer.visible = True
 
         # optional skeleton
-        segs = []
-        if self._skeleton_edges and len(names) > 1:
-            name2idx = {n: i for i, n in enumerate(names)}
-            for a, b in self._skeleton_edges:
-                ia = name2idx.get(a); ib = name2idx.get(b)
-                if ia is None or ib is None:
-                    continue
-                pa, pb = Xw[ia], Xw[ib]
-                if np.any(np.isnan(pa)) or np.any(np.isnan(pb)):
-                    continue
-                segs.append(np.stack([pa, pb], axis=0))
-        if segs:
+        segs = np.zeros((0, 2, 3), float)
+        if len(self._edge_ia) and len(names) > 1:
+            # position of each base within this frame's points (-1 if not shown)
+            pos = np.full(len(self._anno_bases), -1, dtype=np.int64)
+            pos[valid] = np.arange(len(names))
+            ea, eb = pos[self._edge_ia], pos[self._edge_ib]
+            ok = (ea >= 0) & (eb >= 0)
+            segs = np.stack([Xw[ea[ok]], Xw[eb[ok]]], axis=1)
+            segs = segs[~np.isnan(segs).any(axis=(1, 2))]
+        if len(segs):
             data = np.asarray(segs, float)
             if self._skel_layer is None:
                 self._skel_layer = self.viewer.add_shapes(
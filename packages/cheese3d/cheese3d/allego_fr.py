@@ -161,6 +161,67 @@ def read_allego_xdat_all_signals(datasource_name, time_start=None, time_end=None
     return np.reshape(raw_sig_array, (num_samples_sig_array,metadata['status']['signals']['total'])).T, timestamps,  timestamps/fs
 
 
+def read_allego_xdat_signal(datasource_name, channel, time_start=None, time_end=None):
+    ''' returns data source signal data of a single signal over the requested time range
+
+        Parameters
+        ----------
+        datasource_name : str
+            full data source name, including the path & excluding file extensions
+        channel : int
+            index of the requested signal (row of the signal matrix from read_allego_xdat_all_signals)
+        time_start : float, optional
+            requested starting time in seconds
+        time_end : float, optional
+            requested ending time in seconds
+
+        Returns
+        -------
+        signal : numpy array
+            signal data with shape N, where N is number of samples
+
+        Notes
+        -----
+        The signal array file is memory-mapped and only the requested signal is copied,
+        so memory use does not scale with the total number of signals.
+
+        See also
+        --------
+        read_allego_xdat_metadata
+        get_allego_xdat_time_range
+        read_allego_xdat_all_signals
+    '''
+    metadata = read_allego_xdat_metadata(datasource_name)
+    dsource_name = str(Path(datasource_name).expanduser().resolve())
+    fname_signal_array = '{}_data.xdat'.format(dsource_name)
+
+    fs = metadata['status']['samp_freq']
+    num_signals = metadata['status']['signals']['total']
+    time_start = metadata['status']['t_range'][0] if time_start is None else time_start
+    time_end = metadata['status']['t_range'][1] if time_end is None else time_end
+    num_samples = int(round(time_end * fs)) - int(round(time_start * fs))
+
+    if not (-num_signals <= channel < num_signals):
+        raise ValueError('requested signal {} but data source only has {} signals'.format(channel, num_signals))
+
+    tstamp_offset = int(round(time_start * fs)) - metadata['status']['timestamp_range'][0]
+    if tstamp_offset < 0:
+        raise ValueError('requested time start must be >= starting time of file ({})'.format(metadata['status']['t_range'][0]))
+    if tstamp_offset + num_samples > Path(fname_signal_array).stat().st_size / (num_signals * 4):
+        raise ValueError('requested time end is past the ending time of file ({})'.format(metadata['status']['t_range'][1]))
+
+    try:
+        raw_sig_array = np.memmap(fname_signal_array, dtype=np.float32, mode='r',
+                                  offset=tstamp_offset * num_signals * 4,
+                                  shape=(num_samples, num_signals))
+        signal = np.array(raw_sig_array[:, channel])
+        del raw_sig_array
+    except Exception as ex:
+        raise ValueError('could not load signal array data from file {} : {}'.format(fname_signal_array, ex))
+
+    return signal
+
+
 def read_allego_xdat_pri_signals(datasource_name, time_start=None, time_end=None):
     ''' returns data source signal data of 'pri' (amplifier) signals over the requested time range
 
@@ -1,4 +1,5 @@
 import os
+import math
 import shutil
 import yaml
 import pandas as pd
@@ -210,17 +211,17 @@ class DLCBackend(Pose2dBackend):
                 hdf = label_folder / f"CollectedData_{self.experimenter}.h5"
                 if hdf.exists():
                     df = pd.read_hdf(hdf)
+                    # image file names are the last level of the DLC row index
+                    files = df.index.get_level_values(2) # type: ignore
                     annotations = {}
                     for kp in self.keypoints:
-                        annotations[kp.label] = {}
-                        coords_df = df[self.experimenter][kp.label] # type: ignore
-                        for i in range(len(coords_df)):
-                            pt = coords_df.iloc[i]
-                            x, y = pt["x"], pt["y"]
-                            x = None if pd.isna(x) else float(x)
-                            y = None if pd.isna(y) else float(y)
-                            file = pt.name[2]
-                            annotations[kp.label][file] = [[x, y]]
+                        # read the whole (x, y) block at once instead of row by row
+                        coords = df[self.experimenter][kp.label][["x", "y"]] # type: ignore
+                        annotations[kp.label] = {
+                            file: [[None if math.isnan(x) else x,
+                                    None if math.isnan(y) else y]]
+                            for file, (x, y) in zip(files, coords.to_numpy(dtype=float).tolist())
+                        }
                     with open(path / "annotations.yaml", "w") as f:
                         yaml.safe_dump(annotations, f)
 
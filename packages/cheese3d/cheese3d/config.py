@@ -4,6 +4,7 @@ from omegaconf import MISSING, OmegaConf, DictConfig
 from dataclasses import dataclass, field
 from typing import Optional, Dict, List, Any, Literal
 from pathlib import Path
+from functools import lru_cache
 
 from cheese3d.utils import maybe, BoundingBox, RGB
 from cheese3d.synchronize.core import SyncConfig
@@ -50,10 +51,10 @@ class MultiViewConfig(dict[str, VideoConfig]):
         to the view name.
     """
     def __getattr__(self, name):
-        if name in self.keys():
-            return self[name]
-        else:
-            raise AttributeError(name=name, obj=self)
+        try:
+            return dict.__getitem__(self, name)
+        except KeyError:
+            raise AttributeError(name=name, obj=self) from None
 
     def __setattr__(self, name: str, value: VideoConfig, /) -> None:
         self[name] = value
@@ -80,6 +81,12 @@ class KeypointConfig:
     groups: List[str] = field(default_factory=(lambda: ["default"]))
     views: List[str] = field(default_factory=(lambda: []))
 
+@lru_cache(maxsize=None)
+def _structured_schema(cls):
+    # building the schema walks the whole dataclass tree;
+    # OmegaConf.merge copies its inputs, so the cached schema is never mutated
+    return OmegaConf.structured(cls)
+
 def keypoints_by_group(keypoints: List[KeypointConfig]):
     kp_by_group = {}
     for kp in keypoints:
@@ -339,7 +346,7 @@ class ProjectConfig:
         with hydra.initialize_config_dir(str(cfg_file.parent.absolute()),
                                          version_base=None):
             cfg = hydra.compose(cfg_file.name, overrides=overrides)
-        schema = OmegaConf.structured(cls)
+        schema = _structured_schema(cls)
         cfg = OmegaConf.merge(schema, cfg)
         cfg = OmegaConf.to_object(cfg)
 
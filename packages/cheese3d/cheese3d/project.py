@@ -1,15 +1,12 @@
 import re
 import os
-from pydantic.v1.typing import AnnotatedTypeNames
-import toml
-import pandas as pd
 from pathlib import Path
 from dataclasses import dataclass, field
 from omegaconf import OmegaConf
-from rich import table, console
 from rich import print as rprint
 from typing import List, Dict, Optional, Any
-from collections import namedtuple
+from collections import namedtuple, defaultdict
+from functools import cached_property
 
 from cheese3d.anatomy import compute_anatomical_measurements
 from cheese3d.config import (MultiViewConfig,
@@ -27,19 +24,29 @@ from cheese3d.backends.dlc import DLCBackend
 from cheese3d.utils import (dlc_folder_to_components,
                             read_3d_data,
                             reglob,
+                            reglob_match,
                             maybe,
                             get_group_pattern,
-                            relative_path)
+                            relative_path,
+                            update_symlink)
+
+def _make_table(title: str, *columns: str):
+    from rich.table import Table
+
+    return Table(*columns, title=title)
 
 class RecordingKey(namedtuple("RecordingKey", ["session", "name", "attributes"])):
     __slots__ = () # prevent __dict__ creation since subclassing namedtuple
 
     def __new__(cls, session: str, name: str, **attributes):
-        return super().__new__(cls, session, name, frozenset(attributes.items()))
+        # sorted tuple keeps attribute order deterministic
+        return super().__new__(cls, session, name, tuple(sorted(attributes.items())))
 
     def __eq__(self, other):
         if isinstance(other, RecordingKey):
-            return (self.name == other.name) and self.matches(other)
+            # consistent with __hash__: (session, name) identifies a recording
+            # use matches() for partial attribute matching
+            return (self.session == other.session) and (self.name == other.name)
         else:
             return False
 
@@ -55,19 +62,22 @@ class RecordingKey(namedtuple("RecordingKey", ["session", "name", "attributes"])
                 ", ".join([f"{k}: {v}" for k, v in self.attributes]) + ")")
 
     def matches(self, other):
-        is_matched = (self.session == other.session)
-        other_attributes = dict(other.attributes)
+        if self.session != other.session:
+            return False
+        # attribute tuples are short, so a linear scan beats building a dict
         for k, v in self.attributes:
-            if k in other_attributes:
-                is_matched &= (v == other_attributes[k])
+            for other_k, other_v in other.attributes:
+                if (k == other_k) and (v != other_v):
+                    return False
 
-        return is_matched
+        return True
 
 def group_by_session(recordings: Dict[RecordingKey, Any]):
-    sessions = set(r.session for r in recordings.keys())
+    grouped = defaultdict(dict)
+    for k, v in recordings.items():
+        grouped[k.session][k] = v
 
-    return {session: {k: v for k, v in recordings.items() if k.session == session}
-            for session in sessions}
+    return dict(grouped)
 
 def find_videos(dir: Path,
                 recording_regex: str,
@@ -76,37 +86,45 @@ def find_videos(dir: Path,
                 views: MultiViewConfig):
     videos = {}
     calibration_videos = {}
+    recording_pattern = re.compile(recording_regex)
+    # map the view code in a file name to its view in the config
+    view_lookup = {video_cfg.view: view for view, video_cfg in views.items()}
+    calibration_filters = list(calibration_keys.items())
     for recording in sessions:
         if "name" in recording:
             session = recording["name"]
         else:
             raise RuntimeError("Recording entries must contain the 'name' key")
+        recording_filters = [(k, v) for k, v in recording.items() if k != "name"]
         grouped_videos = {}
         grouped_cal_videos = {}
-        matches = [re.match(recording_regex, f)
-                   for f in reglob(recording_regex, path=str(dir / session))]
-        for view, video_cfg in views.items():
-            for match in matches:
-                if (match is None) or (match.group("view") != video_cfg.view):
-                    continue
-                if all(match.group(k) == v
-                       for k, v in recording.items() if k != "name"):
-                    view_start, view_end = match.span("view")
-                    group_name = match.group(0)
-                    group_name = Path(group_name[:view_start] + group_name[view_end:]).stem
-                    group_key = RecordingKey(session,
-                                             group_name,
-                                             **{k: v for k, v in match.groupdict().items()
-                                                     if k != "view"})
-                    if all(match.group(k) == v
-                           for k, v in calibration_keys.items()):
-                        group_dict = grouped_cal_videos
-                    else:
-                        group_dict = grouped_videos
-                    if group_key in group_dict:
-                        group_dict[group_key][view] = Path(match.group(0))
-                    else:
-                        group_dict[group_key] = {view: Path(match.group(0))}
+        for match in reglob_match(recording_pattern, path=os.path.join(dir, session)):
+            groups = match.groupdict()
+            view = view_lookup.get(groups["view"])
+            if view is None:
+                continue
+            if not all(groups[k] == v for k, v in recording_filters):
+                continue
+            video_path = match.group(0)
+            view_start, view_end = match.span("view")
+            group_name = video_path[:view_start] + video_path[view_end:]
+            group_name = os.path.splitext(os.path.basename(group_name))[0]
+            group_key = RecordingKey(session,
+                                     group_name,
+                                     **{k: v for k, v in groups.items() if k != "view"})
+            if all(groups[k] == v for k, v in calibration_filters):
+                group_dict = grouped_cal_videos
+            else:
+                group_dict = grouped_videos
+            if group_key in group_dict:
+                group_dict[group_key][view] = Path(video_path)
+            else:
+                group_dict[group_key] = {view: Path(video_path)}
+        # keep views in config order regardless of file order
+        for group_dict in (grouped_videos, grouped_cal_videos):
+            for group_key, group_views in group_dict.items():
+                group_dict[group_key] = {view: group_views[view]
+                                         for view in views.keys() if view in group_views}
         videos.update(grouped_videos)
         calibration_videos.update(grouped_cal_videos)
 
@@ -115,29 +133,38 @@ def find_videos(dir: Path,
 def find_ephys(dir: Path, ephys_regex: str, sessions: Dict[RecordingKey, Dict[str, Path]]):
     ephys = {}
     grouped_sessions = group_by_session(sessions)
+    ephys_pattern = re.compile(ephys_regex)
 
     for session, session_sessions in grouped_sessions.items():
-        matches = [re.match(ephys_regex, f)
-                   for f in reglob(ephys_regex, path=str(dir / session))]
-        ephys_keys = [RecordingKey(session, m.group(0),
-                                   **{k: v for k, v in m.groupdict().items()})
-                      for m in matches if m is not None]
+        ephys_keys = [RecordingKey(session, m.group(0), **m.groupdict())
+                      for m in reglob_match(ephys_pattern, path=os.path.join(dir, session))]
+        # dict keeps the (alphabetical) file order and allows O(1) removal
+        unmatched_keys = dict.fromkeys(ephys_keys)
         # warn if there are duplicate keys
-        if len(ephys_keys) != len(set(ephys_keys)):
+        if len(ephys_keys) != len(unmatched_keys):
             rprint("[bold red]WARNING:[/bold red] "
                    f"Duplicate matches found for ephys recordings in {session=}."
                    "Ephys recordings will by matched to videos in alphabetical order.")
         for recording in session_sessions.keys():
-            for key in ephys_keys:
-                if recording.matches(key):
-                    # pop key out of ephys_keys
-                    ephys_key = ephys_keys.pop(ephys_keys.index(key))
-                    merged_key = RecordingKey(session, recording.name, **dict(ephys_key.attributes))
+            for ephys_key in unmatched_keys:
+                if recording.matches(ephys_key):
+                    # remove key from the unmatched keys (safe since we break)
+                    del unmatched_keys[ephys_key]
+                    # reuse the already sorted attribute tuple of the ephys key
+                    merged_key = ephys_key._replace(name=recording.name)
                     ephys[merged_key] = dir / session / ephys_key.name
                     break
 
     return ephys
 
+def _relative_link(src: Path, link_dir: Path, root: Path, depth: int):
+    # link_dir is `depth` levels below root, so a source under root can be
+    # reached lexically; otherwise fall back to the (normalizing) os.path.relpath
+    try:
+        return Path(*[os.pardir] * depth, src.relative_to(root))
+    except ValueError:
+        return Path(os.path.relpath(src, link_dir))
+
 def build_model_backend(cfg: ModelConfig | str | Path,
                         root: Path,
                         sessions: Dict[RecordingKey, Dict[str, Path]],
@@ -215,15 +242,17 @@ class Ch3DProject:
     def path(self):
         return self.root / self.name
 
-    @property
+    # the roots are fixed once the project is built,
+    # so the derived paths (and their relpath calls) are computed once
+    @cached_property
     def model_path(self):
         return self.path / relative_path(self.model_root, self.path)
 
-    @property
+    @cached_property
     def recording_path(self):
         return self.path / relative_path(self.video_root, self.path)
 
-    @property
+    @cached_property
     def ephys_path(self):
         if self.ephys_root:
             return self.path / relative_path(self.ephys_root, self.path)
@@ -250,9 +279,11 @@ class Ch3DProject:
     @classmethod
     def from_cfg(cls, cfg: ProjectConfig, root: str | Path, model_import = None):
         root = Path(root)
+        # build the video regex once (used for matching and for the view pattern)
+        video_regex = ProjectConfig.build_regex(cfg.video_regex)
         sessions, calibrations = find_videos(
             dir=root / cfg.name / relative_path(cfg.video_root, root / cfg.name),
-            recording_regex=ProjectConfig.build_regex(cfg.video_regex),
+            recording_regex=video_regex,
             calibration_keys=cfg.calibration,
             sessions=cfg.sessions,
             views=cfg.views
@@ -278,7 +309,7 @@ class Ch3DProject:
                                     sessions=sessions,
                                     view_cfg=cfg.views,
                                     keypoints=cfg.keypoints)
-        view_regex = get_group_pattern(ProjectConfig.build_regex(cfg.video_regex), "view")
+        view_regex = get_group_pattern(video_regex, "view")
 
         return cls(name=cfg.name,
                    root=root,
@@ -309,14 +340,15 @@ class Ch3DProject:
         return cls.from_cfg(cfg, path.parent, model_import=model_import) # type: ignore
 
     def summarize(self, pty = None):
-        pty = maybe(pty, console.Console())
+        # rich's global console is created once and shared across calls
+        from rich import get_console
+        pty = maybe(pty, get_console())
+        recording_path = self.recording_path
         # print basic info
-        tab = table.Table(title="Cheese3D project info")
-        tab.add_column("Key")
-        tab.add_column("Value")
+        tab = _make_table("Cheese3D project info", "Key", "Value")
         tab.add_row("Name", self.name)
         tab.add_row("Root Path", str(self.root))
-        tab.add_row("Video Path", str(self.recording_path))
+        tab.add_row("Video Path", str(recording_path))
         tab.add_row("Model Path", str(self.model_path))
         if self.ephys_param:
             tab.add_row("Ephys Path", str(self.ephys_path))
@@ -329,46 +361,52 @@ class Ch3DProject:
             tab.add_row("Ephys Params", "N/A")
         pty.print(tab)
         # print keypoint info
-        tab = table.Table("Label", "Group(s)", "View(s)", title="Project keypoints")
+        tab = _make_table("Project keypoints", "Label", "Group(s)", "View(s)")
         for pt in self.keypoints:
             tab.add_row(pt.label, ", ".join(pt.groups), ", ".join(pt.views))
         pty.print(tab)
         # print recording info
-        tab = table.Table("Session", "Files (relative to Video Path)", title="Project sessions")
+        tab = _make_table("Project sessions", "Session", "Files (relative to Video Path)")
         for group, files in self.sessions.items():
             tab.add_row(group.as_str(),
-                        ",\n".join([f"{view}: {file.relative_to(self.recording_path)}"
+                        ",\n".join([f"{view}: {file.relative_to(recording_path)}"
                                     for view, file in files.items()]))
         pty.print(tab)
         # print ephys info
         if self.ephys_param:
-            tab = table.Table("Session", "Files (relative to Ephys Path)", title="Project ephys sessions")
+            tab = _make_table("Project ephys sessions",
+                              "Session", "Files (relative to Ephys Path)")
             for group, file in self.ephys_sessions.items(): # type: ignore
-                tab.add_row(group.as_str(), str(file.relative_to(self.recording_path)))
+                tab.add_row(group.as_str(), str(file.relative_to(recording_path)))
             pty.print(tab)
         # print calibration info
-        tab = table.Table("Session", "Files (relative to Recording Path)", title="Project calibrations")
+        tab = _make_table("Project calibrations", "Session", "Files (relative to Recording Path)")
         for group, files in self.calibrations.items():
             tab.add_row(group.as_str(),
-                        ",\n".join([f"{view}: {file.relative_to(self.recording_path)}"
+                        ",\n".join([f"{view}: {file.relative_to(recording_path)}"
                                     for view, file in files.items()]))
         pty.print(tab)
 
     def synchronize(self):
         # run video synchronization first
+        project_path = self.path
+        ref_crop = self.view_config[self.sync.ref_view].get_crop(self.sync.ref_crop)
+        # the reference readers cache their signal,
+        # so each reference video is only decoded once
+        ref_readers = {}
         for recording, views in self.sessions.items():
             rprint(f"[bold green]Synchronizing recording videos:[/bold green] {recording.name}")
-            ref_video = views[self.sync.ref_view]
-            ref_crop = self.view_config[self.sync.ref_view].get_crop(self.sync.ref_crop)
+            ref_source = Path(os.path.join(project_path, views[self.sync.ref_view]))
+            ref_reader = VideoSyncReader(source=ref_source,
+                                         sample_rate=self.fps,
+                                         threshold=self.sync.led_threshold,
+                                         crop=ref_crop)
+            ref_readers[recording] = ref_reader
             for view, video in views.items():
                 if view == self.sync.ref_view:
                     continue
                 crop = self.view_config[view].get_crop(self.sync.ref_crop)
-                ref_reader = VideoSyncReader(source=self.path / ref_video,
-                                             sample_rate=self.fps,
-                                             threshold=self.sync.led_threshold,
-                                             crop=ref_crop)
-                target_reader = VideoSyncReader(source=self.path / video,
+                target_reader = VideoSyncReader(source=Path(os.path.join(project_path, video)),
                                                 sample_rate=self.fps,
                                                 threshold=self.sync.led_threshold,
                                                 crop=crop)
@@ -379,13 +417,9 @@ class Ch3DProject:
         if self.ephys_sessions and self.ephys_param:
             for recording, ephys_file in self.ephys_sessions.items():
                 rprint(f"[bold green]Synchronizing recording ephys:[/bold green] {recording.name}")
-                ref_video = self.sessions[recording][self.sync.ref_view]
-                crop = self.view_config[self.sync.ref_view].get_crop(self.sync.ref_crop)
-                video_reader = VideoSyncReader(source=self.path / ref_video,
-                                               sample_rate=self.fps,
-                                               threshold=self.sync.led_threshold,
-                                               crop=crop)
-                ephys_reader = get_ephys_reader(self.path / ephys_file, self.ephys_param)
+                video_reader = ref_readers[recording]
+                ephys_reader = get_ephys_reader(os.path.join(project_path, ephys_file),
+                                                self.ephys_param)
                 pipeline = SyncPipeline.from_cfg(self.sync, video_reader, ephys_reader)
                 align_params = pipeline.align_recording()
                 pipeline.write_json(align_params)
@@ -479,41 +513,46 @@ class Ch3DProject:
         self.model.train(gpu)
 
     def _setup_anipose(self):
+        import toml
+
         if self.model is None:
             raise RuntimeError("Cannot setup triangulation when pose model does not exist "
                                "(hint: maybe you forgot to set `model.name` in the config?")
         # make anipose project folder
-        self.triangulation_path.mkdir(exist_ok=True)
+        project_path = self.path
+        triangulation_path = self.triangulation_path
+        triangulation_path.mkdir(exist_ok=True)
+        # link folders sit at triangulation/<recording>/<folder>
+        link_depth = len(triangulation_path.relative_to(project_path).parts) + 2
+        # index calibrations by session so each recording only scans its own
+        calibrations_by_session = defaultdict(list)
+        for cal_recording in self.calibrations.keys():
+            calibrations_by_session[cal_recording.session].append(cal_recording)
         # create session subfolders
         for recording, videos in self.sessions.items():
-            session_path = self.triangulation_path / recording.name
+            session_path = triangulation_path / recording.name
             session_path.mkdir(exist_ok=True)
             # add raw videos
             videos_path = session_path / "videos-raw"
             videos_path.mkdir(exist_ok=True)
             for video in videos.values():
-                src = Path(self.path / video)
-                dst = videos_path / src.name
-                relpath = Path(os.path.relpath(src, videos_path))
-                if dst.exists():
-                    os.remove(dst)
-                os.symlink(relpath, dst)
+                src = project_path / video
+                relpath = _relative_link(src, videos_path, project_path, link_depth)
+                update_symlink(relpath, videos_path / src.name)
             # add calibration
             calibration_path = session_path / "calibration"
             calibration_path.mkdir(exist_ok=True)
             # add calibration files
             cal_key = RecordingKey(recording.session, recording.name)
-            matches = [k for k in self.calibrations.keys() if cal_key.matches(k)]
+            matches = [k for k in calibrations_by_session[recording.session]
+                       if cal_key.matches(k)]
             if len(matches) == 0:
                 raise RuntimeError(f"No calibration found for {recording} when setting up triangulation")
             for match in matches:
                 for video in self.calibrations[match].values():
-                    src = Path(self.path / video)
-                    dst = calibration_path / src.name
-                    relpath = Path(os.path.relpath(src, calibration_path))
-                    if dst.exists():
-                        os.remove(dst)
-                    os.symlink(relpath, dst)
+                    src = project_path / video
+                    relpath = _relative_link(src, calibration_path, project_path, link_depth)
+                    update_symlink(relpath, calibration_path / src.name)
         # create anipose config file
         kp_schema = keypoints_by_group(self.keypoints)
         for group, kps in kp_schema.items():
@@ -573,6 +612,8 @@ class Ch3DProject:
         pose_videos_all(self._load_anipose_cfg())
 
     def triangulate(self):
+        import pandas as pd
+
         # first triangulate points using Anipose
         from anipose.triangulate import triangulate_all
         triangulate_all(self._load_anipose_cfg())
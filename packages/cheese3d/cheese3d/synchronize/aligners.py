@@ -6,6 +6,73 @@ from typing import Optional, List
 from cheese3d.synchronize.utils import get_time_points, resample_signal
 from cheese3d.utils import maybe
 
+def _cross_correlate(ref_signal, target_signal):
+    """Full cross-correlation of two equal length signals via the FFT.
+
+    Matches `np.correlate(ref_signal, target_signal, mode="full")`
+    (up to floating point error) but is O(N log N) instead of O(N^2).
+    When both signals have an integer (or bool) dtype, the result is
+    rounded back to exact integer counts; otherwise it is returned as floats."""
+    n = len(ref_signal) + len(target_signal) - 1
+    nfft = 1 << (n - 1).bit_length()
+    ref_fft = np.fft.rfft(ref_signal, nfft)
+    target_fft = np.fft.rfft(target_signal[::-1], nfft)
+    cross_corr = np.fft.irfft(ref_fft * target_fft, nfft)[:n]
+    # bool, signed, or unsigned integer inputs give exact integer counts
+    if all(np.asarray(x).dtype.kind in "biu" for x in (ref_signal, target_signal)):
+        return np.rint(cross_corr).astype(np.int64)
+
+    return cross_corr
+
+def _binary_runs(signal):
+    """Return the (start, end) sample indices of each run of ones in `signal`."""
+    edges = np.flatnonzero(np.diff(signal, prepend=0, append=0))
+
+    return edges[::2], edges[1::2]
+
+def _cross_correlate_binary(ref_signal, target_signal, max_pairs = None):
+    """Exact full cross-correlation of two equal length {0, 1} signals.
+
+    Each pair of on-runs (one per signal) contributes a trapezoid to the
+    cross-correlation, so we place the trapezoid corners as impulses in the
+    second difference and integrate twice. This is O(runs^2 + N) instead of
+    a transform over the whole (mostly zero) signal.
+    Returns `None` when the number of run pairs exceeds `max_pairs`
+    (defaults to the signal length), in which case the FFT is cheaper."""
+    n = len(ref_signal)
+    ref_starts, ref_ends = _binary_runs(ref_signal)
+    target_starts, target_ends = _binary_runs(target_signal)
+    if len(ref_starts) * len(target_starts) > maybe(max_pairs, n):
+        return None
+    # corners of each trapezoid (offset so that lag -(n - 1) is index 0)
+    rise_start = (ref_starts[:, None] - target_ends[None, :]).ravel() + n
+    rise_end = (ref_starts[:, None] - target_starts[None, :]).ravel() + n
+    fall_start = (ref_ends[:, None] - target_ends[None, :]).ravel() + n
+    fall_end = (ref_ends[:, None] - target_starts[None, :]).ravel() + n
+    size = 2 * n + 1
+    impulses = (np.bincount(rise_start, minlength=size) -
+                np.bincount(rise_end, minlength=size) -
+                np.bincount(fall_start, minlength=size) +
+                np.bincount(fall_end, minlength=size))
+
+    return np.cumsum(np.cumsum(impulses))[:(2 * n - 1)]
+
+def _fit_line(x, y):
+    """Least-squares `(slope, intercept)` of `y` onto `x`.
+
+    Uses the closed form for a line instead of the SVD in `np.polyfit`,
+    which is only needed when `x` is constant (degenerate fit)."""
+    dx = x - np.mean(x)
+    dy = y - np.mean(y)
+    var = dx @ dx
+    if var == 0:
+        slope, intercept = np.polyfit(x, y, deg=1)
+    else:
+        slope = (dx @ dy) / var
+        intercept = np.mean(y) - slope * np.mean(x)
+
+    return slope, intercept
+
 @dataclass(frozen=True)
 class AlignmentParams:
     lag: Optional[float] = None
@@ -73,11 +140,22 @@ class CrossCorrelationAligner(BaseAligner):
         target_signal = np.pad(target_signal, (0, max_length - len(target_signal)))
         ref_signal = np.pad(ref_signal, (0, max_length - len(ref_signal)))
 
-        cross_corr = np.correlate(ref_signal, target_signal, mode="full")
-        max_corr = np.max(cross_corr)
-        peaks = np.argwhere(cross_corr == max_corr).flatten()
-        mid_peak = np.argmin(np.abs(peaks - max_length))
-        lag_idx = peaks[mid_peak] - max_length + 1
+        cross_corr = None
+        if (np.array_equal(ref_signal, ref_signal.astype(bool)) and
+            np.array_equal(target_signal, target_signal.astype(bool))):
+            cross_corr = _cross_correlate_binary(ref_signal.astype(np.int8),
+                                                 target_signal.astype(np.int8))
+        if cross_corr is None:
+            cross_corr = _cross_correlate(ref_signal, target_signal)
+        peak = np.argmax(cross_corr)
+        max_corr = cross_corr[peak]
+        # ties do change the lag (the peak nearest zero lag wins),
+        # but we only need to search for them when the peak is not unique
+        peaks = np.flatnonzero(cross_corr[peak + 1:] == max_corr)
+        if len(peaks) > 0:
+            peaks = np.concatenate(([peak], peaks + peak + 1))
+            peak = peaks[np.argmin(np.abs(peaks - max_length))]
+        lag_idx = peak - max_length + 1
         lag_time = float(lag_idx / self.target_sample_rate)
         print("cross correlation lag time: ", lag_time)
 
@@ -122,9 +200,8 @@ class RegressionAligner(BaseAligner):
         ttimes = target_times[:min_length] / target_sample_rate
 
         if len(rtimes) > 0 and len(ttimes) > 0:
-            coefficients = np.polyfit(rtimes, ttimes, deg=1)
-            ttimes_fitted = np.polyval(coefficients, rtimes)
-            lag_slope, lag_time = coefficients
+            lag_slope, lag_time = _fit_line(rtimes, ttimes)
+            ttimes_fitted = lag_slope * rtimes + lag_time
             lag_time = maybe(align_params.lag, 0) - lag_time
             rmse = np.sqrt(np.mean((ttimes_fitted - ttimes) ** 2))
             print("regression lag time: ", lag_time)
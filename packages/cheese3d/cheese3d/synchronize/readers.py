@@ -1,9 +1,11 @@
 import cv2
+import shutil
 import logging
 import numpy as np
 import pandas as pd
 import matplotlib.pyplot as plt
 import matplotlib.patches as patches
+from contextlib import closing
 from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Optional, Dict, Any
@@ -13,6 +15,50 @@ from open_ephys.analysis import Session as OESession
 import cheese3d.allego_fr as afr
 from cheese3d.utils import maybe, BoundingBox, VideoFrames
 
+# BT.601 luma weights in OpenCV's BGR channel order
+_BT601_BGR = (0.114, 0.587, 0.299)
+
+def _frame_brightness(frame):
+    # mean of the BT.601 grayscale image == weighted mean of the channel means
+    # (avoids allocating a grayscale copy of every frame)
+    channel_means = cv2.mean(frame) # type: ignore
+
+    return (_BT601_BGR[0] * channel_means[0] +
+            _BT601_BGR[1] * channel_means[1] +
+            _BT601_BGR[2] * channel_means[2])
+
+def _video_brightness_opencv(video: VideoFrames):
+    brightness = np.empty(len(video), dtype=np.float32)
+    nframes = 0
+    for frame in tqdm(video, desc="process video"):
+        brightness[nframes] = _frame_brightness(frame)
+        nframes += 1
+
+    return brightness[:nframes]
+
+def _video_brightness_ffmpeg(video: VideoFrames):
+    brightness = np.empty(len(video), dtype=np.float32)
+    nframes = 0
+    # decode to BGR (not ffmpeg's gray luma plane) so the brightness scale,
+    # and hence the absolute cuts in `VideoSyncReader`, match the opencv path
+    with closing(video.iter_ffmpeg(pix_fmt="bgr24")) as frames:
+        for frame in tqdm(frames, total=len(brightness), desc="process video"):
+            if nframes >= len(brightness):
+                nframes += 1 # more frames than expected
+                break
+            brightness[nframes] = _frame_brightness(frame)
+            nframes += 1
+    if nframes == 0:
+        logging.warning(f"ffmpeg could not decode {video.path}, falling back to opencv")
+        return None
+    elif nframes != len(brightness):
+        # a frame count mismatch would shift every LED frame index
+        logging.warning(f"ffmpeg decoded a different number of frames of {video.path} "
+                        f"(expected {len(brightness)}), falling back to opencv")
+        return None
+
+    return brightness
+
 @dataclass
 class SyncSignalReader:
     """Abstract base class for reading synchronization signals from a source.
@@ -48,19 +94,26 @@ class VideoSyncReader(SyncSignalReader):
 
     Additional attributes:
     - `crop`: Tuple of (left, right, top, bottom) coordinates for cropping.
+
+    The thresholded signal is cached after the first `load_signal` call,
+    so a single reader can be shared as the reference for several targets.
     """
     crop: BoundingBox = field(default_factory=lambda: [None, None, None, None])
+    _led_signal: Optional[np.ndarray] = field(default=None, init=False, repr=False)
 
     def load_signal(self):
+        if self._led_signal is not None:
+            return self._led_signal
         print(self.source)
         video = VideoFrames(str(self.source), bounds=self.crop)
         # get average brightness level
-        brightness = []
-        for i, frame in enumerate(tqdm(video, desc="process video")):
-            frame = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY) # type: ignore
-            brightness.append(np.mean(frame))
+        # (decode + crop + grayscale in ffmpeg when available, else fall back to opencv)
+        brightness = None
+        if shutil.which("ffmpeg") is not None:
+            brightness = _video_brightness_ffmpeg(video)
+        if brightness is None:
+            brightness = _video_brightness_opencv(video)
         # get peak brightness level
-        brightness = np.asarray(brightness)
         hist, bin_edges = np.histogram(brightness, bins=100)
         min_brightness = bin_edges[np.argmax(hist) + 1]
         brightness = brightness - min_brightness
@@ -75,10 +128,10 @@ class VideoSyncReader(SyncSignalReader):
             peak_brightness = np.max(brightness)
         # threshold brightness
         led_threshold = maybe(self.threshold, 0.9) * peak_brightness
-        led_signal = np.where(brightness > led_threshold, 1, 0)
+        led_signal = (brightness > led_threshold).view(np.int8)
         # save exemplar frame if possible
-        if np.sum(led_signal) > 0:
-            exemplar_idx = np.where(led_signal)[0]
+        exemplar_idx = np.flatnonzero(led_signal)
+        if len(exemplar_idx) > 0:
             exemplar_frame = video.imgs[exemplar_idx[0]]
             title = f" (frame = {exemplar_idx[0]})"
         else:
@@ -107,6 +160,7 @@ class VideoSyncReader(SyncSignalReader):
         ax.axis('off')
         fig.savefig(f"{video.path.rstrip('.avi')}-qc-bbox.png", bbox_inches="tight")
         plt.close(fig)
+        self._led_signal = led_signal
 
         return led_signal
 
@@ -118,14 +172,14 @@ class AllegoSyncReader(SyncSignalReader):
     channel: int = 32
 
     def load_signal(self):
-        channels, _, _ = afr.read_allego_xdat_all_signals(
+        analog_signal = afr.read_allego_xdat_signal(
             datasource_name=self.root_path(),
+            channel=self.channel,
             time_start=self.time_start,
             time_end=self.time_end
         )
-        analog_signal = channels[self.channel]
         threshold = maybe(self.threshold, 0.1)
-        analog_signal = np.where(analog_signal > threshold, 1, 0)
+        analog_signal = (analog_signal > threshold).view(np.int8)
 
         return analog_signal
 
@@ -153,13 +207,19 @@ class OpenEphysSyncReader(SyncSignalReader):
         # then we create a binary signal that is high between these edges
         analog_signal = channels[:, self.channel]
         threshold = maybe(self.threshold, 0.1)
-        analog_signal_pos = np.where(analog_signal > threshold, 1, 0)
-        analog_signal_pos = np.where(np.diff(analog_signal_pos))[0]
-        analog_signal_neg = np.where(-analog_signal > threshold, 1, 0)
-        analog_signal_neg = np.where(np.diff(analog_signal_neg))[0]
-        analog_signal = np.zeros_like(analog_signal)
-        for start, end in zip(analog_signal_pos, analog_signal_neg):
-            analog_signal[start:end] = 1
+        analog_signal_pos = (analog_signal > threshold).view(np.int8)
+        analog_signal_pos = np.flatnonzero(np.diff(analog_signal_pos))
+        analog_signal_neg = (analog_signal < -threshold).view(np.int8)
+        analog_signal_neg = np.flatnonzero(np.diff(analog_signal_neg))
+        npairs = min(len(analog_signal_pos), len(analog_signal_neg))
+        starts = analog_signal_pos[:npairs]
+        ends = analog_signal_neg[:npairs]
+        # mark each [start, end) gate with +1/-1 and integrate
+        # (empty gates where end <= start are dropped, like an empty slice)
+        valid = ends > starts
+        gates = (np.bincount(starts[valid], minlength=len(analog_signal) + 1) -
+                 np.bincount(ends[valid], minlength=len(analog_signal) + 1))
+        analog_signal = (np.cumsum(gates)[:-1] > 0).view(np.int8)
 
         return analog_signal
 
@@ -168,10 +228,13 @@ class OpenEphysSyncReader(SyncSignalReader):
 
 class DSISyncReader(SyncSignalReader):
     def load_signal(self):
-        led_df = pd.read_csv(self.source, sep="\t", names=["timestamp", "signal"])
-        analog_signal = led_df["signal"].values
+        # only parse the signal column (the timestamps are unused)
+        led_df = pd.read_csv(self.source, sep="\t", names=["timestamp", "signal"],
+                             usecols=["signal"], dtype={"signal": np.float32},
+                             engine="c")
+        analog_signal = led_df["signal"].to_numpy()
         threshold = maybe(self.threshold, 0.1)
-        analog_signal = np.where(analog_signal > threshold, 1, 0) # type: ignore
+        analog_signal = (analog_signal > threshold).view(np.int8)
 
         return analog_signal
 
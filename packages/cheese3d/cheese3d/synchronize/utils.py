@@ -7,4 +7,5 @@ def resample_signal(signal, source_rate, target_rate):
         return np.repeat(signal, int(target_rate / source_rate))
 
 def get_time_points(signal):
-    return np.where(np.diff(signal) > 0)[0]
+    # compare neighbours directly (one temporary instead of diff + where)
+    return np.flatnonzero(signal[1:] > signal[:-1])
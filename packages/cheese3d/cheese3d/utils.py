@@ -1,12 +1,12 @@
 import os
 import re
-import pims
+import subprocess
 import cv2
 import numpy as np
-import pandas as pd
 from glob import glob
 from typing import List, Optional, Tuple
 from contextlib import contextmanager
+from functools import lru_cache
 from pathlib import Path
 
 # (top left x, top left y, bottom right x, bottom right y)
@@ -14,6 +14,11 @@ from pathlib import Path
 BoundingBox = List[Optional[int]]
 RGB = Tuple[int, int, int]
 
+# rows parsed at a time when streaming large CSV files
+_CSV_CHUNKSIZE = 65536
+# forward gap (in frames) below which reading through is cheaper than seeking
+_MAX_READ_GAP = 64
+
 class VideoFrames:
     """
     A (potentially time shifted) video indexed by frames for a recording session
@@ -27,6 +32,8 @@ class VideoFrames:
         max bounds)
     """
     def __init__(self, path, shift = 0, bounds = [None, None, None, None]):
+        import pims
+
         self.imgs = pims.Video(path)
         self.shift = shift
         self.bounds = bounds
@@ -38,20 +45,78 @@ class VideoFrames:
     def __getitem__(self, i):
         return cropframe(self.imgs[self.shifted_index(i)], self.bounds)
 
+    def __getitems__(self, indices):
+        return self.frames(indices)
+
     def __len__(self):
         return len(self.imgs) - self.shift
 
+    def frames(self, indices):
+        """
+        Read many frames at once (in the order given), decoding sequentially
+        in frame order instead of seeking for every index.
+        Frames are returned in RGB like `__getitem__`.
+
+        Arguments:
+        - `indices`: a sequence of (unshifted) frame indices
+        """
+        indices = np.asarray(indices, dtype=int)
+        order = np.argsort(indices, kind="stable")
+        out = [None] * len(indices)
+        sx, ex, sy, ey = self.bounds
+        with self.opencv_capture() as video:
+            current, frame = -1, None
+            for slot in order:
+                target = self.shifted_index(int(indices[slot]))
+                # seeking decodes from the previous keyframe,
+                # so only seek for large jumps and read through small gaps
+                if (target < current) or (target - current > _MAX_READ_GAP):
+                    video.set(cv2.CAP_PROP_POS_FRAMES, target) # type: ignore
+                    current = target - 1
+                while current < target:
+                    ret, frame = video.read()
+                    if not ret:
+                        raise IndexError(f"Frame {target} is out of range for {self.path}")
+                    current += 1
+                frame_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB) # type: ignore
+                out[slot] = frame_rgb[sy:ey, sx:ex]
+
+        return out
+
     @contextmanager
     def opencv_capture(self):
         cap = cv2.VideoCapture(self.path) # type: ignore
         try:
             yield cap
         finally:
+            # no HighGUI windows are ever created, so there is nothing to
+            # destroy (and destroyAllWindows can initialize a GUI backend)
             cap.release()
-            cv2.destroyAllWindows() # type: ignore
 
     def __iter__(self):
-        # use opencv for faster iteration
+        # decode sequentially with PyAV (multi-threaded) for faster iteration
+        try:
+            import av
+        except ImportError:
+            yield from self._iter_opencv()
+            return
+        sx, ex, sy, ey = self.bounds
+        start = max(self.shift, 0)
+        stop = start + len(self)
+        container = av.open(str(self.path))
+        try:
+            stream = container.streams.video[0]
+            stream.thread_type = "AUTO"
+            for i, frame in enumerate(container.decode(stream)):
+                if i < start:
+                    continue
+                if i >= stop:
+                    break
+                yield frame.to_ndarray(format="bgr24")[sy:ey, sx:ex]
+        finally:
+            container.close()
+
+    def _iter_opencv(self):
         sx, ex, sy, ey = self.bounds
         with self.opencv_capture() as video:
             video.set(cv2.CAP_PROP_POS_FRAMES, max(self.shift, 0)) # type: ignore
@@ -62,6 +127,64 @@ class VideoFrames:
                 else:
                     break
 
+    def iter_ffmpeg(self, pix_fmt = "gray"):
+        """
+        Iterate over the cropped frames using an `ffmpeg` subprocess to decode,
+        crop, and convert the pixel format (requires `ffmpeg` on the `PATH`).
+        Each frame is yielded as a view into a reused buffer,
+        so copy it if it needs to outlive the iteration step.
+        Note that `"gray"` is ffmpeg's luma plane, which for limited-range
+        inputs is not on the same scale as OpenCV's BGR -> gray conversion;
+        use `"bgr24"` to match the frames from iterating with OpenCV.
+
+        Arguments:
+        - `pix_fmt = "gray"`: the output pixel format (`"gray"` or `"bgr24"`)
+        """
+        channels = {"gray": 1, "bgr24": 3}[pix_fmt]
+        # resolve the crop bounds (python slice semantics) to an explicit region
+        height, width = VideoFrames.get_dims(self.path)
+        sx, ex, sy, ey = self.bounds
+        x0, x1, _ = slice(sx, ex).indices(int(width))
+        y0, y1, _ = slice(sy, ey).indices(int(height))
+        crop_w, crop_h = x1 - x0, y1 - y0
+        if (crop_w <= 0) or (crop_h <= 0):
+            return
+        # convert before cropping so the crop is not snapped to the chroma grid
+        # of subsampled inputs (e.g. yuv420p), and keep the size exact
+        filters = [f"format={pix_fmt}", f"crop={crop_w}:{crop_h}:{x0}:{y0}:exact=1"]
+        if self.shift > 0:
+            filters.insert(0, f"trim=start_frame={self.shift},setpts=PTS-STARTPTS")
+        cmd = ["ffmpeg", "-v", "error", "-nostdin",
+               "-i", str(self.path),
+               "-vf", ",".join(filters),
+               # pass frames through as decoded (rawvideo has no timestamps,
+               # so the default would resample to a constant frame rate and
+               # duplicate/drop frames around timestamp gaps)
+               "-vsync", "0",
+               "-f", "rawvideo", "-pix_fmt", pix_fmt, "-"]
+        frame_size = crop_w * crop_h * channels
+        buffer = np.empty(frame_size, dtype=np.uint8)
+        frame = buffer.reshape((crop_h, crop_w) if channels == 1 else (crop_h, crop_w, channels))
+        view = memoryview(buffer) # type: ignore
+        proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, bufsize=frame_size * 32)
+        try:
+            while True:
+                # read exactly one frame into the reused buffer
+                nbytes = 0
+                while nbytes < frame_size:
+                    nread = proc.stdout.readinto(view[nbytes:]) # type: ignore
+                    if not nread:
+                        break
+                    nbytes += nread
+                if nbytes < frame_size:
+                    break
+                yield frame
+        finally:
+            proc.stdout.close() # type: ignore
+            if proc.poll() is None:
+                proc.kill()
+            proc.wait()
+
     def __str__(self):
         return str(self.path)
 
@@ -71,10 +194,66 @@ class VideoFrames:
         height = cap.get(cv2.CAP_PROP_FRAME_HEIGHT) # type: ignore
         width = cap.get(cv2.CAP_PROP_FRAME_WIDTH) # type: ignore
         cap.release()
-        # cv2.destroyAllWindows() # type: ignore
 
         return height, width
 
+# sentinel marking the end of a video in iter_many
+_END_OF_VIDEO = object()
+
+def iter_many(videos: List[VideoFrames], buffer_size = 8):
+    """
+    Iterate several videos in lockstep, decoding each one on its own thread
+    (decoding releases the GIL). Yields a tuple with one frame per video
+    and stops at the end of the shortest video.
+
+    Arguments:
+    - `videos`: a list of `VideoFrames` to iterate
+    - `buffer_size = 8`: the number of decoded frames to buffer per video
+    """
+    import queue
+    import threading
+    from concurrent.futures import ThreadPoolExecutor
+
+    if len(videos) == 0:
+        return
+    queues = [queue.Queue(maxsize=buffer_size) for _ in videos]
+    stop = threading.Event()
+
+    def _put(q, item):
+        # give up if the consumer stopped early (so the thread can exit)
+        while not stop.is_set():
+            try:
+                q.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                pass
+        return False
+
+    def _decode(video, q):
+        try:
+            for frame in video:
+                if not _put(q, frame):
+                    return
+        except Exception as e:
+            _put(q, e)
+            return
+        _put(q, _END_OF_VIDEO)
+
+    with ThreadPoolExecutor(max_workers=len(videos)) as pool:
+        for video, q in zip(videos, queues):
+            pool.submit(_decode, video, q)
+        try:
+            while True:
+                frames = tuple(q.get() for q in queues)
+                for frame in frames:
+                    if isinstance(frame, Exception):
+                        raise frame
+                if any(frame is _END_OF_VIDEO for frame in frames):
+                    break
+                yield frames
+        finally:
+            stop.set()
+
 def cropframe(image, crop_coords):
     sx, ex, sy, ey = crop_coords
 
@@ -93,20 +272,95 @@ def relative_path(path: str | Path, start: str | Path):
     else:
         return path
 
+def update_symlink(target: str | Path, link: str | Path):
+    """
+    Make `link` a symbolic link pointing to `target`, replacing any existing
+    file at `link` (nothing is touched if the link is already correct).
+
+    Arguments:
+    - `target`: the path the link should point to (stored as given)
+    - `link`: the path of the link to create
+    """
+    target = os.fspath(target)
+    try:
+        os.symlink(target, link)
+    except FileExistsError:
+        try:
+            if os.readlink(link) == target:
+                return
+        except OSError: # not a symlink
+            pass
+        os.remove(link)
+        os.symlink(target, link)
+
+@lru_cache(maxsize=256)
+def _compile_regex(pattern):
+    # compiled patterns hash by value, so these hit the cache too
+    return re.compile(pattern)
+
 def reglob(pattern, path = None, recursive = False):
     """
     `glob` a filesystem using regex patterns.
 
     Arguments:
     - `pattern`: a regex pattern compatible with Python's `re`
+        (either a string or an already compiled pattern)
     - `path`: the root under which to search
     - `recursive`: set to true to search the path recursively
     """
-    path = os.getcwd() if path is None else path
-    files = glob(os.sep.join([path, "**"]), recursive=recursive)
-    regex = re.compile(pattern)
+    path = os.getcwd() if path is None else os.fspath(path)
+    regex = _compile_regex(pattern)
+    if recursive: # glob("**", recursive=True) includes the root itself
+        root = os.path.join(path, "")
+        files = [root] if regex.search(root) is not None else []
+    else:
+        files = []
+    files.extend(_walk_matches(path, regex, recursive))
+
+    return sorted(files)
+
+def _walk_matches(path, regex, recursive):
+    # filter while scanning instead of building the full glob listing first
+    try:
+        with os.scandir(path) as it:
+            entries = [entry for entry in it if not entry.name.startswith(".")]
+    except OSError: # glob silently skips unreadable or missing directories
+        return
+    for entry in entries:
+        f = os.path.join(path, entry.name)
+        if regex.search(f) is not None:
+            yield f
+        if recursive:
+            try:
+                is_dir = entry.is_dir()
+            except OSError:
+                is_dir = False
+            if is_dir:
+                yield from _walk_matches(f, regex, recursive)
+
+def reglob_match(pattern, path = None):
+    """
+    Scan a directory once and yield the regex match for every entry
+    whose full path matches `pattern` (like `reglob` followed by `re.match`).
 
-    return sorted([f for f in files if regex.search(f) is not None])
+    Arguments:
+    - `pattern`: a regex pattern compatible with Python's `re`
+        (either a string or an already compiled pattern)
+    - `path`: the directory to search (non-recursively)
+    """
+    path = os.getcwd() if path is None else os.fspath(path)
+    regex = _compile_regex(pattern)
+    try:
+        with os.scandir(path) as entries:
+            # skip hidden entries to match glob semantics
+            files = sorted(os.path.join(path, entry.name)
+                           for entry in entries if not entry.name.startswith("."))
+    except (FileNotFoundError, NotADirectoryError):
+        return
+    for f in files:
+        match = regex.match(f)
+        if match is not None:
+            yield match
 
 def dlc_folder_to_components(folder: str | Path):
     *name, experimenter, year, month, date = Path(folder).name.split("-")
@@ -124,23 +378,50 @@ def read_3d_data(data_dir: str | Path, extra_cols = None):
 
     ### Returns
     A dictionary of 3D data where each key is a landmark name
-    and the associated value is an array of shape `(time, 3)`.
+    and the associated value is a float32 array of shape `(time, 3)`.
     If `extra_cols` is provided, an additional dictionary is returned where each
     entry corresponds to an extra column and the value is dictionary of landmarks
     to arrays of shape `(time,)`.
     """
+    import pandas as pd
+
     files = glob(str(Path(data_dir) / "pose-3d" / "*.csv"))
-    data = pd.read_csv(files[0])
-    cols = data.head() # name of all the columns
-    landmark_names = np.unique([s.split('_')[0]
-                                for s in cols if s.endswith(('_x', '_y', '_z'))])
-    landmarks = {landmark: np.stack([data[f"{landmark}_x"],
-                                     data[f"{landmark}_y"],
-                                     data[f"{landmark}_z"]], axis=-1)
-                 for landmark in landmark_names}
+    cols = pd.read_csv(files[0], nrows=0).columns # only parse the header
+    # strip the axis suffix, keeping the landmark order of the CSV
+    landmark_names = list(dict.fromkeys(s[:-2] for s in cols
+                                        if s.endswith(('_x', '_y', '_z'))))
+    coord_cols = [f"{landmark}_{axis}" for landmark in landmark_names for axis in "xyz"]
+    extra_data_cols = [f"{landmark}_{col}"
+                       for col in maybe(extra_cols, []) for landmark in landmark_names]
+    # only parse the columns that are returned, streaming the CSV in chunks
+    # (coordinates are stored as float32, which is plenty for keypoint positions)
+    chunks = pd.read_csv(files[0],
+                         usecols=coord_cols + extra_data_cols,
+                         dtype={col: np.float32 for col in coord_cols},
+                         chunksize=_CSV_CHUNKSIZE)
+    # write each chunk into a preallocated output that is grown (doubled) in place,
+    # so the parsed chunks never coexist with the full result
+    coords = np.empty((_CSV_CHUNKSIZE, len(landmark_names), 3), dtype=np.float32)
+    extra_chunks = []
+    nrows = 0
+    for chunk in chunks:
+        end = nrows + len(chunk)
+        if end > len(coords):
+            # (realloc, no views of coords are alive here)
+            coords.resize((max(end, 2 * len(coords)),) + coords.shape[1:], refcheck=False)
+        coords[nrows:end] = chunk[coord_cols].to_numpy(dtype=np.float32) \
+                                             .reshape(-1, len(landmark_names), 3)
+        if extra_data_cols:
+            extra_chunks.append(chunk[extra_data_cols])
+        nrows = end
+    coords.resize((nrows,) + coords.shape[1:], refcheck=False) # trim the unused capacity
+    landmarks = {landmark: coords[:, i, :] for i, landmark in enumerate(landmark_names)}
 
     if extra_cols is not None:
-        extra_landmarks = {col: {landmark: np.asarray(data[f"{landmark}_{col}"])
+        # each extra column keeps its own dtype (e.g. integer `*_ncams`)
+        extra_data = (pd.concat(extra_chunks, ignore_index=True) if extra_chunks
+                      else pd.DataFrame(columns=extra_data_cols))
+        extra_landmarks = {col: {landmark: extra_data[f"{landmark}_{col}"].to_numpy()
                                  for landmark in landmark_names}
                            for col in extra_cols}
 